@@ -1,7 +1,418 @@
+import heapq
 import math
 from typing import List, Tuple, Set, Dict
 from collections import defaultdict, deque
 
+import numpy as np
+from scipy.spatial import cKDTree
+from scipy.spatial.distance import cdist
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional - fall back to pure Python kernels
+    njit = None
+
+
+def _count_row_amps(dir_src, row_of_node, n_rows):
+    """Count edges powered per row, indexed by compact row id."""
+    out = np.zeros(n_rows, dtype=np.int32)
+    for i in range(dir_src.shape[0]):
+        src = dir_src[i]
+        if src >= 0:
+            out[row_of_node[src]] += 1
+    return out
+
+
+def _count_node_outputs(dir_src, is_artnet, n_nodes):
+    """Count outgoing edges per node, indexed by compact node id."""
+    out = np.zeros(n_nodes, dtype=np.int32)
+    for i in range(dir_src.shape[0]):
+        src = dir_src[i]
+        if src >= 0 and is_artnet[src] == 1:
+            out[src] += 1
+    return out
+
+
+def _greedy_cover_ids(edge_start_id, edge_end_id, incidence_ptr, incidence_idx, n_nodes):
+    """Greedy edge cover over CSR incidence arrays.
+
+    Returns (picked node ids, edges newly covered per pick).
+    """
+    n_edges = edge_start_id.shape[0]
+    uncovered = np.ones(n_edges, dtype=np.uint8)
+    coverage = np.zeros(n_nodes, dtype=np.int32)
+    for e in range(n_edges):
+        coverage[edge_start_id[e]] += 1
+        coverage[edge_end_id[e]] += 1
+
+    remaining = n_edges
+    picks = np.empty(n_nodes, dtype=np.int32)
+    pick_counts = np.empty(n_nodes, dtype=np.int32)
+    n_picks = 0
+
+    while remaining > 0:
+        best = 0
+        best_coverage = coverage[0]
+        for i in range(1, n_nodes):
+            if coverage[i] > best_coverage:
+                best_coverage = coverage[i]
+                best = i
+        if best_coverage == 0:
+            break
+
+        picks[n_picks] = best
+        pick_counts[n_picks] = best_coverage
+        n_picks += 1
+
+        for p in range(incidence_ptr[best], incidence_ptr[best + 1]):
+            e = incidence_idx[p]
+            if uncovered[e] == 1:
+                uncovered[e] = 0
+                remaining -= 1
+                coverage[edge_start_id[e]] -= 1
+                coverage[edge_end_id[e]] -= 1
+
+    return picks[:n_picks], pick_counts[:n_picks]
+
+
+def _balance_phases(edge_src, edge_dst, row_of_node, is_artnet,
+                    nbr_ptr, nbr_idx, artnet_order, n_rows,
+                    max_amps, max_ports, max_iterations, order_buf):
+    """Phased row-power / port balancing over the int-id network mirror.
+
+    Mutates edge_src/edge_dst in place (edge_src[i] == -1 means no flow)
+    and returns (iterations, improvements). nbr_ptr/nbr_idx is a CSR
+    layout of each node's ArtNet neighbours; artnet_order lists ArtNet
+    node ids in their original scan order. order_buf is caller-provided
+    scratch of at least n_rows entries, so the hot loop never allocates.
+    """
+    n_edges = edge_src.shape[0]
+    n_nodes = row_of_node.shape[0]
+
+    # Per-row amp and per-node output counters, maintained by delta below
+    row_amps = np.zeros(n_rows, dtype=np.int32)
+    node_outputs = np.zeros(n_nodes, dtype=np.int32)
+    for i in range(n_edges):
+        if edge_src[i] >= 0:
+            row_amps[row_of_node[edge_src[i]]] += 1
+            node_outputs[edge_src[i]] += 1
+
+    # Aggregate stats are computed once and then maintained at the mutation
+    # sites, so iterations do not re-scan every row and node. The powered
+    # edge total is invariant under moves; the peak is rescanned lazily only
+    # when the peak row loses an edge without another row taking over.
+    n_row_viol = 0
+    max_row = 0
+    nonzero_rows = 0
+    powered_total = 0
+    for r in range(n_rows):
+        if row_amps[r] > max_amps:
+            n_row_viol += 1
+        if row_amps[r] > max_row:
+            max_row = row_amps[r]
+        if row_amps[r] > 0:
+            nonzero_rows += 1
+            powered_total += row_amps[r]
+    n_node_viol = 0
+    for k in range(artnet_order.shape[0]):
+        if node_outputs[artnet_order[k]] > max_ports:
+            n_node_viol += 1
+    max_dirty = False
+
+    # Rows holding at least one ArtNet node - the only rows a Phase-2 move
+    # can target, so their minimum load bounds what a move can achieve
+    row_has_artnet = np.zeros(n_rows, dtype=np.uint8)
+    for n in range(n_nodes):
+        if is_artnet[n] == 1:
+            row_has_artnet[row_of_node[n]] = 1
+
+    def apply_move(i, new_src, reverse, cur_max):
+        """Repoint edge i to new_src (swapping ends on reversal) and return
+        the deltas for the cached stats: (d_row_viol, d_node_viol,
+        d_nonzero_rows, peak_dirty, new_max)."""
+        s = edge_src[i]
+        d_rv = 0
+        d_nv = 0
+        d_nz = 0
+
+        r_old = row_of_node[s]
+        row_amps[r_old] -= 1
+        if row_amps[r_old] == max_amps:
+            d_rv -= 1
+        if row_amps[r_old] == 0:
+            d_nz -= 1
+        dirty = row_amps[r_old] + 1 == cur_max
+        node_outputs[s] -= 1
+        if is_artnet[s] == 1 and node_outputs[s] == max_ports:
+            d_nv -= 1
+
+        r_new = row_of_node[new_src]
+        row_amps[r_new] += 1
+        if row_amps[r_new] == max_amps + 1:
+            d_rv += 1
+        if row_amps[r_new] == 1:
+            d_nz += 1
+        node_outputs[new_src] += 1
+        if is_artnet[new_src] == 1 and node_outputs[new_src] == max_ports + 1:
+            d_nv += 1
+
+        new_max = cur_max
+        if row_amps[r_new] >= cur_max:
+            # The destination row is the peak now; no rescan needed
+            new_max = row_amps[r_new]
+            dirty = False
+
+        if reverse:
+            edge_dst[i] = s
+        edge_src[i] = new_src
+        return d_rv, d_nv, d_nz, dirty, new_max
+
+    def sort_rows_desc():
+        """Fill order_buf with row ids by descending load, stable on id,
+        matching a stable argsort on -row_amps without the allocations."""
+        for r in range(n_rows):
+            order_buf[r] = r
+        for a in range(1, n_rows):
+            v = order_buf[a]
+            key = row_amps[v]
+            b = a - 1
+            while b >= 0 and row_amps[order_buf[b]] < key:
+                order_buf[b + 1] = order_buf[b]
+                b -= 1
+            order_buf[b + 1] = v
+
+    iteration = 0
+    improvements = 0
+    phase = 1
+    best_max_row = 2147483647
+    stall = 0
+
+    while iteration < max_iterations:
+        if max_dirty:
+            max_row = 0
+            for r in range(n_rows):
+                if row_amps[r] > max_row:
+                    max_row = row_amps[r]
+            max_dirty = False
+
+        # Phase transitions
+        if phase == 1 and n_row_viol == 0 and n_node_viol == 0:
+            phase = 2
+            best_max_row = max_row
+            stall = 0
+            continue
+        elif phase == 2 and stall >= 30:
+            phase = 3
+            best_max_row = max_row
+            stall = 0
+            continue
+
+        # Track if max row power is improving (Phases 2 & 3)
+        if phase >= 2:
+            if max_row < best_max_row:
+                best_max_row = max_row
+                stall = 0
+            else:
+                stall += 1
+            if phase == 3 and stall >= 50:
+                break
+
+        made_improvement = False
+
+        # Phase 2: move edges from high-load rows to less-loaded feeds
+        if phase == 2:
+            if nonzero_rows > 0:
+                avg_amps = powered_total / nonzero_rows
+                min_artnet_row = 2147483647
+                for r in range(n_rows):
+                    if row_has_artnet[r] == 1 and row_amps[r] < min_artnet_row:
+                        min_artnet_row = row_amps[r]
+                sort_rows_desc()
+                for oi in range(n_rows):
+                    high_row = order_buf[oi]
+                    high_amps = row_amps[high_row]
+                    if high_amps == 0:
+                        break
+                    if high_amps <= min_artnet_row:
+                        # Every candidate feed row is at least this loaded, so
+                        # no strict improvement exists for this or lower rows
+                        break
+                    if high_amps <= avg_amps and high_amps < max_row:
+                        continue
+
+                    # Nearest populated rows on either side get priority
+                    prev_row = -1
+                    for r in range(high_row - 1, -1, -1):
+                        if row_amps[r] > 0:
+                            prev_row = r
+                            break
+                    next_row = -1
+                    for r in range(high_row + 1, n_rows):
+                        if row_amps[r] > 0:
+                            next_row = r
+                            break
+
+                    for i in range(n_edges):
+                        s = edge_src[i]
+                        if s < 0 or row_of_node[s] != high_row:
+                            continue
+                        d = edge_dst[i]
+                        # Branchless candidate scoring: the acceptance checks
+                        # fold into the priority as a sentinel penalty, so the
+                        # fan-out loop is a pure running max LLVM can
+                        # if-convert instead of unpredictable branches
+                        best_pri = -2147483648
+                        best_alt = -1
+                        for k in range(nbr_ptr[d], nbr_ptr[d + 1]):
+                            alt = nbr_idx[k]
+                            alt_row = row_of_node[alt]
+                            alt_amps = row_amps[alt_row]
+                            ok = ((alt != s) & (alt_amps < max_amps) &
+                                  (node_outputs[alt] < max_ports) &
+                                  (alt_amps < high_amps))
+                            pri = (100 * ((alt_row == prev_row) |
+                                          (alt_row == next_row)) -
+                                   alt_amps - (1 - ok) * (1 << 30))
+                            if pri > best_pri:
+                                best_pri = pri
+                                best_alt = alt
+                        if best_pri > -(1 << 29):
+                            d_rv, d_nv, d_nz, dirty, max_row = apply_move(
+                                i, best_alt, False, max_row)
+                            n_row_viol += d_rv
+                            n_node_viol += d_nv
+                            nonzero_rows += d_nz
+                            if dirty:
+                                max_dirty = True
+                            improvements += 1
+                            made_improvement = True
+                            break
+                    if made_improvement:
+                        break
+
+        # Phase 3: reverse ArtNet-to-ArtNet edges out of the peak rows
+        if phase == 3 and not made_improvement:
+            sort_rows_desc()
+            for oi in range(n_rows):
+                high_row = order_buf[oi]
+                high_amps = row_amps[high_row]
+                if high_amps < max_row or high_amps == 0:
+                    continue
+                for i in range(n_edges):
+                    s = edge_src[i]
+                    if s < 0 or row_of_node[s] != high_row:
+                        continue
+                    d = edge_dst[i]
+                    if is_artnet[s] == 0 or is_artnet[d] == 0:
+                        continue
+                    t_row = row_of_node[d]
+                    if (row_amps[t_row] < max_amps and
+                            node_outputs[d] < max_ports and
+                            row_amps[t_row] < high_amps):
+                        d_rv, d_nv, d_nz, dirty, max_row = apply_move(
+                            i, d, True, max_row)
+                        n_row_viol += d_rv
+                        n_node_viol += d_nv
+                        nonzero_rows += d_nz
+                        if dirty:
+                            max_dirty = True
+                        improvements += 1
+                        made_improvement = True
+                        break
+                if made_improvement:
+                    break
+
+        # Phase 1: redirect edges out of the (last) overloaded row
+        if phase == 1 and not made_improvement:
+            viol_row = -1
+            for r in range(n_rows):
+                if row_amps[r] > max_amps:
+                    viol_row = r
+            if viol_row >= 0:
+                for i in range(n_edges):
+                    s = edge_src[i]
+                    if s < 0 or row_of_node[s] != viol_row:
+                        continue
+                    d = edge_dst[i]
+                    for k in range(nbr_ptr[d], nbr_ptr[d + 1]):
+                        alt = nbr_idx[k]
+                        if alt == s:
+                            continue
+                        if (row_amps[row_of_node[alt]] < max_amps and
+                                node_outputs[alt] < max_ports):
+                            d_rv, d_nv, d_nz, dirty, max_row = apply_move(
+                                i, alt, False, max_row)
+                            n_row_viol += d_rv
+                            n_node_viol += d_nv
+                            nonzero_rows += d_nz
+                            if dirty:
+                                max_dirty = True
+                            improvements += 1
+                            made_improvement = True
+                            break
+                    if made_improvement:
+                        break
+
+        # Phase 1: redirect edges away from over-subscribed ArtNet nodes
+        if phase == 1 and not made_improvement:
+            for k in range(artnet_order.shape[0]):
+                node = artnet_order[k]
+                if node_outputs[node] <= max_ports:
+                    continue
+                for i in range(n_edges):
+                    if edge_src[i] != node:
+                        continue
+                    d = edge_dst[i]
+                    for kk in range(nbr_ptr[d], nbr_ptr[d + 1]):
+                        alt = nbr_idx[kk]
+                        if alt == node:
+                            continue
+                        if (row_amps[row_of_node[alt]] < max_amps and
+                                node_outputs[alt] < max_ports):
+                            d_rv, d_nv, d_nz, dirty, max_row = apply_move(
+                                i, alt, False, max_row)
+                            n_row_viol += d_rv
+                            n_node_viol += d_nv
+                            nonzero_rows += d_nz
+                            if dirty:
+                                max_dirty = True
+                            improvements += 1
+                            made_improvement = True
+                            break
+                    if made_improvement:
+                        break
+                if made_improvement:
+                    break
+
+        if not made_improvement and phase < 3:
+            break
+
+        iteration += 1
+
+    return iteration, improvements
+
+
+if njit is not None:
+    # Explicit signatures compile eagerly and, with cache=True, persist the
+    # machine code on disk so later imports skip JIT warmup entirely
+    _count_row_amps = njit(
+        "int32[:](int32[:], int32[:], int64)",
+        cache=True)(_count_row_amps)
+    _count_node_outputs = njit(
+        "int32[:](int32[:], uint8[:], int64)",
+        cache=True)(_count_node_outputs)
+    _greedy_cover_ids = njit(
+        "Tuple((int32[:], int32[:]))(int32[:], int32[:], int32[:], int32[:], int64)",
+        cache=True)(_greedy_cover_ids)
+    _balance_phases = njit(
+        "UniTuple(int64, 2)(int32[:], int32[:], int32[:], uint8[:], "
+        "int32[:], int32[:], int32[:], int64, int64, int64, int64, int32[:])",
+        cache=True)(_balance_phases)
+
+# Reusable scratch for _balance_phases row ordering, grown on demand so
+# repeated optimizer runs in a session never reallocate it
+_balance_order_buf = np.empty(0, dtype=np.int32)
+
 
 class ArtNetOptimizer:
     def __init__(self, nodes: Set[Tuple[float, float, float]], edges: List[Tuple[Tuple[float, float, float], Tuple[float, float, float]]]):
@@ -15,14 +426,26 @@ class ArtNetOptimizer:
         self.nodes = nodes
         self.edges = edges
         self.node_list = list(nodes)
-        self.adjacency = self._build_adjacency()
-        
-    def _build_adjacency(self) -> Dict[Tuple[float, float, float], List[Tuple[float, float, float]]]:
-        """Build adjacency list for the network."""
-        adjacency = defaultdict(list)
-        for start, end in self.edges:
-            adjacency[start].append(end)
-            adjacency[end].append(start)
+        self._nodes_arr = np.asarray(self.node_list, dtype=np.float32)
+        self._node_index = {node: i for i, node in enumerate(self.node_list)}
+        # Integer-id edge list so hot loops index instead of hashing float tuples
+        self._edges_i = [(self._node_index[start], self._node_index[end])
+                         for start, end in self.edges]
+        # SoA edge layout: coordinate and id arrays for bulk edge math
+        self.edge_start = np.asarray([start for start, _ in self.edges], dtype=np.float32)
+        self.edge_end = np.asarray([end for _, end in self.edges], dtype=np.float32)
+        self.edge_start_id = np.array([s for s, _ in self._edges_i], dtype=np.int32)
+        self.edge_end_id = np.array([e for _, e in self._edges_i], dtype=np.int32)
+        self.adjacency_i = self._build_adjacency()
+        self.degrees = np.array([len(neighbors) for neighbors in self.adjacency_i],
+                                dtype=np.int32)
+
+    def _build_adjacency(self) -> List[List[int]]:
+        """Build adjacency list over compact integer node ids."""
+        adjacency = [[] for _ in self.node_list]
+        for start_i, end_i in self._edges_i:
+            adjacency[start_i].append(end_i)
+            adjacency[end_i].append(start_i)
         return adjacency
     
     def _calculate_distance(self, node1: Tuple[float, float, float], node2: Tuple[float, float, float]) -> float:
@@ -35,23 +458,18 @@ class ArtNetOptimizer:
         
         Args:
             num_artnet_nodes: Number of ArtNet nodes to place
-            
+
         Returns:
             List of node coordinates for ArtNet placement
         """
         if num_artnet_nodes >= len(self.nodes):
             return list(self.nodes)
         
-        # Calculate degree centrality (number of connections)
-        degree_centrality = {}
-        for node in self.nodes:
-            degree_centrality[node] = len(self.adjacency[node])
-        
-        # Sort nodes by degree centrality (most connected first)
-        sorted_nodes = sorted(degree_centrality.items(), key=lambda x: x[1], reverse=True)
-        
-        # Take top nodes as initial ArtNet candidates
-        artnet_candidates = [node for node, _ in sorted_nodes[:num_artnet_nodes * 2]]
+        # Select the most connected nodes as initial ArtNet candidates;
+        # argpartition picks the top 2k by degree in O(N) without a full sort
+        num_candidates = min(num_artnet_nodes * 2, len(self.node_list))
+        top_idx = np.argpartition(-self.degrees, num_candidates - 1)[:num_candidates]
+        artnet_candidates = [self.node_list[i] for i in top_idx]
         
         # Use k-means clustering to find optimal distribution
         artnet_nodes = self._k_means_clustering(artnet_candidates, num_artnet_nodes)
@@ -71,50 +489,56 @@ class ArtNetOptimizer:
         """
         if k >= len(candidates):
             return candidates[:k]
-        
-        # Initialize centroids with first k candidates
-        centroids = candidates[:k]
-        
+
+        cand_arr = np.asarray(candidates, dtype=np.float32)
+        rng = np.random.default_rng(0)  # Fixed seed keeps runs reproducible
+
+        # kmeans++ seeding: pick one candidate, then sample each next centroid
+        # with probability proportional to squared distance from the nearest
+        # already-chosen centroid
+        centroids = np.empty((k, 3), dtype=np.float32)
+        centroids[0] = cand_arr[rng.integers(len(candidates))]
+        min_sq_dist = ((cand_arr - centroids[0]) ** 2).sum(axis=1)
+        for j in range(1, k):
+            total = min_sq_dist.sum()
+            if total > 0:
+                idx = rng.choice(len(candidates), p=min_sq_dist / total)
+            else:
+                idx = rng.integers(len(candidates))
+            centroids[j] = cand_arr[idx]
+            min_sq_dist = np.minimum(min_sq_dist, ((cand_arr - centroids[j]) ** 2).sum(axis=1))
+
         for _ in range(10):  # Max 10 iterations
-            # Assign each candidate to nearest centroid
-            clusters = [[] for _ in range(k)]
-            
-            for candidate in candidates:
-                min_dist = float('inf')
-                best_cluster = 0
-                
-                for i, centroid in enumerate(centroids):
-                    dist = self._calculate_distance(candidate, centroid)
-                    if dist < min_dist:
-                        min_dist = dist
-                        best_cluster = i
-                
-                clusters[best_cluster].append(candidate)
-            
-            # Update centroids
-            new_centroids = []
-            for cluster in clusters:
-                if cluster:
-                    # Find the node closest to the cluster center
-                    center_x = sum(node[0] for node in cluster) / len(cluster)
-                    center_y = sum(node[1] for node in cluster) / len(cluster)
-                    center_z = sum(node[2] for node in cluster) / len(cluster)
-                    
-                    closest_node = min(cluster, key=lambda node: 
-                        self._calculate_distance(node, (center_x, center_y, center_z)))
-                    new_centroids.append(closest_node)
-                else:
-                    # If cluster is empty, keep the old centroid
-                    new_centroids.append(centroids[len(new_centroids)])
-            
+            # Assign each candidate to its nearest centroid with one cdist call
+            assignments = cdist(cand_arr, centroids).argmin(axis=1)
+
+            # True arithmetic-mean update (no snap-to-member per iteration),
+            # accumulated in one scatter-add instead of a per-cluster loop
+            sums = np.zeros((k, 3), dtype=np.float64)
+            np.add.at(sums, assignments, cand_arr)
+            counts = np.bincount(assignments, minlength=k)
+            new_centroids = centroids.copy()
+            nonempty = counts > 0
+            new_centroids[nonempty] = (sums[nonempty] / counts[nonempty, None]).astype(np.float32)
+
             # Check for convergence
-            if all(self._calculate_distance(old, new) < 0.1 
-                   for old, new in zip(centroids, new_centroids)):
-                break
-                
+            converged = (np.linalg.norm(new_centroids - centroids, axis=1) < 0.1).all()
             centroids = new_centroids
-        
-        return centroids
+            if converged:
+                break
+
+        # Snap centroids back to actual candidate nodes once, at the end
+        _, snap_idx = cKDTree(cand_arr).query(centroids)
+        chosen = list(dict.fromkeys(candidates[i] for i in snap_idx))
+        if len(chosen) < k:
+            # Two centroids snapped to the same node - top up from the pool
+            for candidate in candidates:
+                if candidate not in chosen:
+                    chosen.append(candidate)
+                    if len(chosen) == k:
+                        break
+
+        return chosen
     
     def _assign_dmx_universes(self, artnet_nodes: List[Tuple[float, float, float]]) -> Dict[Tuple[float, float, float], int]:
         """
@@ -131,75 +555,115 @@ class ArtNetOptimizer:
             universe_assignments[node] = i + 1  # Universes start at 1
         return universe_assignments
     
-    def _find_nearest_artnet_node(self, node: Tuple[float, float, float], 
-                                 artnet_nodes: List[Tuple[float, float, float]]) -> Tuple[Tuple[float, float, float], float]:
+    def _find_nearest_artnet_node(self, node: Tuple[float, float, float],
+                                 artnet_nodes: List[Tuple[float, float, float]],
+                                 artnet_arr: np.ndarray = None) -> Tuple[Tuple[float, float, float], float]:
         """
         Find the nearest ArtNet node to a given node.
-        
+
         Args:
             node: Node to find nearest ArtNet for
             artnet_nodes: List of ArtNet node coordinates
-            
+            artnet_arr: Optional precomputed (M, 3) array of artnet_nodes
+
         Returns:
             Tuple of (nearest_artnet_node, distance)
         """
-        min_dist = float('inf')
-        nearest_node = None
-        
-        for artnet_node in artnet_nodes:
-            dist = self._calculate_distance(node, artnet_node)
-            if dist < min_dist:
-                min_dist = dist
-                nearest_node = artnet_node
-        
-        return nearest_node, min_dist
+        if artnet_arr is None:
+            artnet_arr = np.asarray(artnet_nodes, dtype=np.float32)
+
+        dists = np.linalg.norm(artnet_arr - np.asarray(node, dtype=np.float32), axis=1)
+        nearest_idx = int(dists.argmin())
+
+        return artnet_nodes[nearest_idx], float(dists[nearest_idx])
     
-    def _find_minimal_artnet_coverage(self) -> List[Tuple[float, float, float]]:
+    def _find_minimal_artnet_coverage(self, verbose: bool = False) -> List[Tuple[float, float, float]]:
         """
         Find the minimal set of ArtNet nodes that covers all edges.
         Uses a greedy algorithm to minimize the number of ArtNet nodes.
-        
+
+        Args:
+            verbose: Print per-pick progress
+
         Returns:
             List of ArtNet node coordinates
         """
-        uncovered_edges = set(self.edges)
+        vprint = print if verbose else (lambda *args, **kwargs: None)
+        if njit is not None:
+            # Compiled path: run the whole greedy in a typed kernel over a
+            # CSR incidence layout
+            n = len(self.node_list)
+            degrees = np.bincount(np.concatenate([self.edge_start_id, self.edge_end_id]),
+                                  minlength=n)
+            incidence_ptr = np.zeros(n + 1, dtype=np.int32)
+            incidence_ptr[1:] = np.cumsum(degrees)
+            incidence_idx = np.empty(int(incidence_ptr[-1]), dtype=np.int32)
+            fill_pos = incidence_ptr[:-1].copy()
+            for edge_idx, (start_i, end_i) in enumerate(self._edges_i):
+                incidence_idx[fill_pos[start_i]] = edge_idx
+                fill_pos[start_i] += 1
+                incidence_idx[fill_pos[end_i]] = edge_idx
+                fill_pos[end_i] += 1
+
+            picks, pick_counts = _greedy_cover_ids(self.edge_start_id, self.edge_end_id,
+                                                   incidence_ptr, incidence_idx, n)
+
+            artnet_nodes = []
+            remaining = len(self.edges)
+            for node_id, covered in zip(picks, pick_counts):
+                node = self.node_list[node_id]
+                artnet_nodes.append(node)
+                remaining -= int(covered)
+                vprint(f"Added ArtNet node at {node}, covering {covered} edges. {remaining} edges remaining.")
+            return artnet_nodes
+
+        # Pure-Python fallback: lazy max-heap greedy
+        # Map each node id to the indices of its incident edges
+        node_to_edges = defaultdict(list)
+        for edge_idx, (start_i, end_i) in enumerate(self._edges_i):
+            node_to_edges[start_i].append(edge_idx)
+            node_to_edges[end_i].append(edge_idx)
+
+        # Incremental greedy: track how many uncovered edges each node would
+        # cover, and only update the counts of nodes touched by covered edges
+        uncovered = np.ones(len(self.edges), dtype=bool)
+        remaining = len(self.edges)
+        coverage = np.array([len(node_to_edges[i]) for i in range(len(self.node_list))])
         artnet_nodes = []
-        
-        while uncovered_edges:
-            # Find the node that covers the most uncovered edges
-            best_node = None
-            max_coverage = 0
-            
-            for node in self.nodes:
-                if node in artnet_nodes:
-                    continue
-                
-                # Count how many uncovered edges this node would cover
-                coverage = 0
-                for edge in uncovered_edges:
-                    if edge[0] == node or edge[1] == node:
-                        coverage += 1
-                
-                if coverage > max_coverage:
-                    max_coverage = coverage
-                    best_node = node
-            
-            if best_node is None:
-                break
-            
-            # Add the best node as an ArtNet node
+
+        # Lazy max-heap over (-coverage, node id): stale entries are skipped
+        # on pop, updated nodes are simply re-pushed
+        heap = [(-int(c), i) for i, c in enumerate(coverage) if c > 0]
+        heapq.heapify(heap)
+
+        while remaining > 0 and heap:
+            neg_coverage, best_idx = heapq.heappop(heap)
+            max_coverage = -neg_coverage
+            if max_coverage != coverage[best_idx]:
+                continue  # Stale entry - this node's count changed since push
+
+            best_node = self.node_list[best_idx]
             artnet_nodes.append(best_node)
-            
-            # Remove covered edges
-            edges_to_remove = set()
-            for edge in uncovered_edges:
-                if edge[0] == best_node or edge[1] == best_node:
-                    edges_to_remove.add(edge)
-            
-            uncovered_edges -= edges_to_remove
-            
-            print(f"Added ArtNet node at {best_node}, covering {max_coverage} edges. {len(uncovered_edges)} edges remaining.")
-        
+
+            # Cover this node's edges and decrement both endpoints' counts
+            touched = set()
+            for edge_idx in node_to_edges[best_idx]:
+                if uncovered[edge_idx]:
+                    uncovered[edge_idx] = False
+                    remaining -= 1
+                    start_i, end_i = self._edges_i[edge_idx]
+                    coverage[start_i] -= 1
+                    coverage[end_i] -= 1
+                    touched.add(start_i)
+                    touched.add(end_i)
+
+            touched.discard(best_idx)
+            for node_idx in touched:
+                if coverage[node_idx] > 0:
+                    heapq.heappush(heap, (-int(coverage[node_idx]), node_idx))
+
+            vprint(f"Added ArtNet node at {best_node}, covering {max_coverage} edges. {remaining} edges remaining.")
+
         return artnet_nodes
     
     def _optimize_within_constraint(self, artnet_nodes: List[Tuple[float, float, float]], 
@@ -217,29 +681,28 @@ class ArtNetOptimizer:
         """
         if len(artnet_nodes) <= max_nodes:
             return artnet_nodes
-        
-        # Calculate coverage for each node
-        node_coverage = {}
-        for node in artnet_nodes:
-            coverage = 0
-            for edge in self.edges:
-                if edge[0] == node or edge[1] == node:
-                    coverage += 1
-            node_coverage[node] = coverage
-        
-        # Sort by coverage (highest first)
-        sorted_nodes = sorted(node_coverage.items(), key=lambda x: x[1], reverse=True)
-        
-        # Take the top nodes
-        return [node for node, _ in sorted_nodes[:max_nodes]]
+
+        # Tally edge coverage for every node in one bincount over endpoint ids
+        endpoints = np.concatenate([self.edge_start_id, self.edge_end_id])
+        coverage_all = np.bincount(endpoints, minlength=len(self.node_list))
+
+        artnet_ids = np.array([self._node_index[node] for node in artnet_nodes])
+        coverage = coverage_all[artnet_ids]
+
+        # argpartition selects the top max_nodes in O(N); sort just the winners
+        top = np.argpartition(-coverage, max_nodes - 1)[:max_nodes]
+        top = top[np.argsort(-coverage[top])]
+
+        return [artnet_nodes[i] for i in top]
     
-    def optimize_artnet_distribution(self, num_artnet_nodes: int = None) -> Dict:
+    def optimize_artnet_distribution(self, num_artnet_nodes: int = None, verbose: bool = False) -> Dict:
         """
         Optimize ArtNet node distribution for the LED network.
         Ensures every edge is connected to at least one ArtNet node.
         
         Args:
             num_artnet_nodes: Number of ArtNet nodes to place (None for auto-determination)
+            verbose: Print optimization progress
             
         Returns:
             Dictionary containing optimization results:
@@ -251,40 +714,50 @@ class ArtNetOptimizer:
             - 'avg_distance': Average distance from nodes to their ArtNet nodes
             - 'coverage_stats': Statistics about network coverage
         """
+        vprint = print if verbose else (lambda *args, **kwargs: None)
+
         # Find minimal set of ArtNet nodes that covers all edges
-        artnet_nodes = self._find_minimal_artnet_coverage()
+        artnet_nodes = self._find_minimal_artnet_coverage(verbose=verbose)
         
         if num_artnet_nodes is not None and len(artnet_nodes) > num_artnet_nodes:
             # If user specified a limit, try to optimize within that constraint
             artnet_nodes = self._optimize_within_constraint(artnet_nodes, num_artnet_nodes)
         
-        print(f"Determined {len(artnet_nodes)} ArtNet nodes to cover all edges")
+        vprint(f"Determined {len(artnet_nodes)} ArtNet nodes to cover all edges")
         
         # Assign DMX universes
         universe_assignments = self._assign_dmx_universes(artnet_nodes)
         
-        # Assign each node to nearest ArtNet node
-        node_assignments = {}
-        distances = []
-        
-        for node in self.nodes:
-            nearest_artnet, distance = self._find_nearest_artnet_node(node, artnet_nodes)
-            node_assignments[node] = nearest_artnet
-            distances.append(distance)
-        
+        # Assign each node to nearest ArtNet node with one batched KD-tree
+        # query; workers=-1 fans the lookup out across all cores (the query
+        # releases the GIL)
+        tree = cKDTree(np.asarray(artnet_nodes, dtype=np.float32))
+        distances, nearest_idx = tree.query(self._nodes_arr, k=1, workers=-1)
+
+        node_assignments = {node: artnet_nodes[idx]
+                            for node, idx in zip(self.node_list, nearest_idx)}
+
         # Calculate statistics
-        max_distance = max(distances)
-        avg_distance = sum(distances) / len(distances)
+        max_distance = float(distances.max())
+        avg_distance = float(distances.mean())
         
         # Determine end nodes (nodes that are not ArtNet nodes)
-        end_nodes = [node for node in self.nodes if node not in artnet_nodes]
-        
+        artnet_node_set = set(artnet_nodes)
+        end_nodes = [node for node in self.nodes if node not in artnet_node_set]
+
+        # A node is covered if it is an ArtNet node or shares an edge with one
+        artnet_mask = np.zeros(len(self.node_list), dtype=bool)
+        artnet_mask[[self._node_index[node] for node in artnet_nodes]] = True
+        covered_mask = artnet_mask.copy()
+        covered_mask[self.edge_start_id[artnet_mask[self.edge_end_id]]] = True
+        covered_mask[self.edge_end_id[artnet_mask[self.edge_start_id]]] = True
+
         # Calculate coverage statistics
         coverage_stats = {
             'total_nodes': len(self.nodes),
             'artnet_nodes': len(artnet_nodes),
             'end_nodes': len(end_nodes),
-            'coverage_percentage': (len(self.nodes) / len(self.nodes)) * 100,
+            'coverage_percentage': (int(covered_mask.sum()) / len(self.nodes)) * 100,
             'artnet_node_utilization': len(self.nodes) / len(artnet_nodes)
         }
         
@@ -305,22 +778,21 @@ class ArtNetOptimizer:
         Returns:
             Dictionary with network statistics
         """
-        total_length = 0
-        for start, end in self.edges:
-            total_length += self._calculate_distance(start, end)
-        
+        total_length = float(np.linalg.norm(self.edge_end - self.edge_start, axis=1).sum())
+
         return {
             'total_nodes': len(self.nodes),
             'total_edges': len(self.edges),
             'total_length': total_length,
-            'avg_degree': sum(len(self.adjacency[node]) for node in self.nodes) / len(self.nodes),
+            'avg_degree': float(self.degrees.mean()),
             'network_density': len(self.edges) / (len(self.nodes) * (len(self.nodes) - 1) / 2) if len(self.nodes) > 1 else 0
         }
 
 
 def balance_edge_directions(edges: List[Tuple[Tuple[float, float, float], Tuple[float, float, float]]], 
                            artnet_nodes: List[Tuple[float, float, float]],
-                           max_outputs_per_node: int = 4) -> Dict:
+                           max_outputs_per_node: int = 4,
+                           verbose: bool = False) -> Dict:
     """
     Balance edge directions to ensure no ArtNet node has more than max_outputs_per_node data outputs.
     
@@ -331,6 +803,7 @@ def balance_edge_directions(edges: List[Tuple[Tuple[float, float, float], Tuple[
         edges: List of edge tuples (start_node, end_node)
         artnet_nodes: List of ArtNet node coordinates
         max_outputs_per_node: Maximum number of data outputs per ArtNet node (default 4)
+        verbose: Print optimization progress
         
     Returns:
         Dictionary containing:
@@ -339,69 +812,68 @@ def balance_edge_directions(edges: List[Tuple[Tuple[float, float, float], Tuple[
         - 'artnet_output_counts': Dict mapping each ArtNet node to its number of outgoing edges
         - 'violations': List of ArtNet nodes that still exceed the limit (if any)
     """
+    vprint = print if verbose else (lambda *args, **kwargs: None)
     artnet_set = set(artnet_nodes)
-    
-    # Map each edge to the ArtNet node(s) it connects to
-    edge_to_artnet = {}
+
+    # Classify every edge endpoint once via a boolean mask over compact node
+    # ids - no per-edge set hashing in the assignment loop below
+    node_index = {}
     for edge in edges:
-        start, end = edge
-        artnet_on_edge = []
-        if start in artnet_set:
-            artnet_on_edge.append(('start', start))
-        if end in artnet_set:
-            artnet_on_edge.append(('end', end))
-        
-        if artnet_on_edge:
-            edge_to_artnet[edge] = artnet_on_edge
-    
+        for node in edge:
+            if node not in node_index:
+                node_index[node] = len(node_index)
+    for node in artnet_nodes:
+        if node not in node_index:
+            node_index[node] = len(node_index)
+
+    artnet_mask = np.zeros(len(node_index), dtype=bool)
+    artnet_mask[[node_index[node] for node in artnet_nodes]] = True
+    start_is_art = artnet_mask[np.array([node_index[start] for start, _ in edges], dtype=np.int32)]
+    end_is_art = artnet_mask[np.array([node_index[end] for _, end in edges], dtype=np.int32)]
+
     # Count current outgoing edges per ArtNet node (assuming data flows FROM ArtNet nodes)
     artnet_outputs = {node: 0 for node in artnet_nodes}
     edge_directions = {}  # Maps original edge to (data_start, data_end)
-    
+
     # First pass: Assign directions, preferring the default (FROM ArtNet node)
-    for edge in edges:
+    for edge_idx, edge in enumerate(edges):
         start, end = edge
-        
-        if edge not in edge_to_artnet:
-            # No ArtNet node on this edge - no data flow
-            edge_directions[edge] = (None, None)
-            continue
-        
-        artnet_on_edge = edge_to_artnet[edge]
-        
-        if len(artnet_on_edge) == 2:
+
+        if start_is_art[edge_idx] and end_is_art[edge_idx]:
             # Both ends are ArtNet nodes - choose direction based on current load
-            artnet_start = start
-            artnet_end = end
-            
-            if artnet_outputs[artnet_start] <= artnet_outputs[artnet_end]:
+            if artnet_outputs[start] <= artnet_outputs[end]:
                 # Start node has fewer outputs, use it as source
-                edge_directions[edge] = (artnet_start, artnet_end)
-                artnet_outputs[artnet_start] += 1
+                edge_directions[edge] = (start, end)
+                artnet_outputs[start] += 1
             else:
                 # End node has fewer outputs, use it as source
-                edge_directions[edge] = (artnet_end, artnet_start)
-                artnet_outputs[artnet_end] += 1
-        
-        elif len(artnet_on_edge) == 1:
-            # Only one end is an ArtNet node
-            position, artnet_node = artnet_on_edge[0]
-            other_node = end if position == 'start' else start
-            
-            # Data flows FROM ArtNet node by default
-            edge_directions[edge] = (artnet_node, other_node)
-            artnet_outputs[artnet_node] += 1
+                edge_directions[edge] = (end, start)
+                artnet_outputs[end] += 1
+
+        elif start_is_art[edge_idx]:
+            # Data flows FROM the ArtNet node by default
+            edge_directions[edge] = (start, end)
+            artnet_outputs[start] += 1
+        elif end_is_art[edge_idx]:
+            edge_directions[edge] = (end, start)
+            artnet_outputs[end] += 1
+        else:
+            # No ArtNet node on this edge - no data flow
+            edge_directions[edge] = (None, None)
     
     # Build adjacency list to find alternative ArtNet nodes for simple nodes
     node_to_artnet_neighbors = {}  # Maps each node to all connected ArtNet nodes
-    for edge in edges:
+    node_to_edge_ids = defaultdict(list)  # Maps each node to its incident edge indices
+    for edge_idx, edge in enumerate(edges):
         start, end = edge
+        node_to_edge_ids[start].append(edge_idx)
+        node_to_edge_ids[end].append(edge_idx)
         # Track which ArtNet nodes each node is connected to
-        if start in artnet_set:
+        if start_is_art[edge_idx]:
             if end not in node_to_artnet_neighbors:
                 node_to_artnet_neighbors[end] = []
             node_to_artnet_neighbors[end].append(start)
-        if end in artnet_set:
+        if end_is_art[edge_idx]:
             if start not in node_to_artnet_neighbors:
                 node_to_artnet_neighbors[start] = []
             node_to_artnet_neighbors[start].append(end)
@@ -410,30 +882,39 @@ def balance_edge_directions(edges: List[Tuple[Tuple[float, float, float], Tuple[
     violations = [node for node, count in artnet_outputs.items() if count > max_outputs_per_node]
     
     if violations:
-        print(f"\n⚠️  Found {len(violations)} ArtNet nodes exceeding {max_outputs_per_node} output limit")
+        vprint(f"\n⚠️  Found {len(violations)} ArtNet nodes exceeding {max_outputs_per_node} output limit")
         
         for overloaded_node in violations:
             current_count = artnet_outputs[overloaded_node]
             excess = current_count - max_outputs_per_node
             
-            print(f"   Node {overloaded_node}: {current_count} outputs (need to reduce by {excess})")
+            vprint(f"   Node {overloaded_node}: {current_count} outputs (need to reduce by {excess})")
             
             # Find edges that can be redirected
             # Two types of reversible edges:
             # 1. Both ends are ArtNet nodes (direct reversal)
             # 2. End node is a simple node that's also connected to another ArtNet node with capacity
-            reversible_edges = []
-            
-            for edge, (data_start, data_end) in edge_directions.items():
+            # Parallel candidate arrays: action 0 = direct reversal (both ends
+            # ArtNet), 1 = redirect via an alternative ArtNet node
+            cand_edges = []
+            cand_alts = []
+            cand_actions = []
+            cand_capacity = []
+
+            # Only the overloaded node's incident edges can flow from it
+            for edge_idx in node_to_edge_ids[overloaded_node]:
+                edge = edges[edge_idx]
+                data_start, data_end = edge_directions[edge]
                 if data_start != overloaded_node:
                     continue
-                
+
                 # Type 1: Direct reversal (both ends are ArtNet nodes)
                 if data_end in artnet_set:
-                    other_artnet = data_end
-                    other_capacity = max_outputs_per_node - artnet_outputs[other_artnet]
-                    reversible_edges.append((edge, 'direct', other_artnet, other_capacity))
-                
+                    cand_edges.append(edge)
+                    cand_alts.append(data_end)
+                    cand_actions.append(0)
+                    cand_capacity.append(max_outputs_per_node - artnet_outputs[data_end])
+
                 # Type 2: Redirect via alternative ArtNet node
                 elif data_end in node_to_artnet_neighbors:
                     # This simple node is connected to other ArtNet nodes
@@ -442,21 +923,29 @@ def balance_edge_directions(edges: List[Tuple[Tuple[float, float, float], Tuple[
                             # Can redirect this simple node to use the alternative ArtNet node
                             other_capacity = max_outputs_per_node - artnet_outputs[alternative_artnet]
                             if other_capacity > 0:
-                                reversible_edges.append((edge, 'redirect', alternative_artnet, other_capacity))
-            
-            # Sort by available capacity (prefer nodes with most capacity)
-            reversible_edges.sort(key=lambda x: -x[3])  # Sort by capacity (descending)
-            
+                                cand_edges.append(edge)
+                                cand_alts.append(alternative_artnet)
+                                cand_actions.append(1)
+                                cand_capacity.append(other_capacity)
+
+            # Order by available capacity (prefer nodes with most capacity);
+            # stable argsort mirrors the previous list sort
+            capacities = np.asarray(cand_capacity, dtype=np.int32)
+            actions = np.asarray(cand_actions, dtype=np.uint8)
+            order = np.argsort(-capacities, kind='stable')
+
             # Redirect/reverse edges until we're under the limit
             reversed_count = 0
             redirected_count = 0
-            
-            for edge, action_type, other_artnet, capacity in reversible_edges:
+
+            for cand_idx in order:
                 if artnet_outputs[overloaded_node] <= max_outputs_per_node:
                     break
-                
-                if capacity > 0:
-                    if action_type == 'direct':
+
+                if capacities[cand_idx] > 0:
+                    edge = cand_edges[cand_idx]
+                    other_artnet = cand_alts[cand_idx]
+                    if actions[cand_idx] == 0:
                         # Direct reversal (both ends are ArtNet nodes)
                         old_start, old_end = edge_directions[edge]
                         edge_directions[edge] = (old_end, old_start)
@@ -478,18 +967,18 @@ def balance_edge_directions(edges: List[Tuple[Tuple[float, float, float], Tuple[
                     action_summary.append(f"{reversed_count} reversed")
                 if redirected_count > 0:
                     action_summary.append(f"{redirected_count} redirected")
-                print(f"   → {', '.join(action_summary)}, new count: {artnet_outputs[overloaded_node]}")
+                vprint(f"   → {', '.join(action_summary)}, new count: {artnet_outputs[overloaded_node]}")
     
     # Check for remaining violations
     remaining_violations = [node for node, count in artnet_outputs.items() if count > max_outputs_per_node]
     
     if remaining_violations:
-        print(f"\n❌ Warning: {len(remaining_violations)} ArtNet nodes still exceed limit:")
+        vprint(f"\n❌ Warning: {len(remaining_violations)} ArtNet nodes still exceed limit:")
         for node in remaining_violations:
-            print(f"   Node {node}: {artnet_outputs[node]} outputs (limit: {max_outputs_per_node})")
-        print("   → Consider adding more ArtNet nodes to reduce load")
+            vprint(f"   Node {node}: {artnet_outputs[node]} outputs (limit: {max_outputs_per_node})")
+        vprint("   → Consider adding more ArtNet nodes to reduce load")
     else:
-        print(f"\n✅ All ArtNet nodes balanced: max {max(artnet_outputs.values())} outputs per node")
+        vprint(f"\n✅ All ArtNet nodes balanced: max {max(artnet_outputs.values())} outputs per node")
     
     # Build directed edges list
     directed_edges = []
@@ -505,12 +994,39 @@ def balance_edge_directions(edges: List[Tuple[Tuple[float, float, float], Tuple[
     }
 
 
+def _artnet_neighbors_csr(edge_ids: List[Tuple[int, int]], is_artnet: np.ndarray,
+                          n_nodes: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Build a CSR layout of each node's ArtNet neighbours from edge id pairs.
+
+    Returns (nbr_ptr, nbr_idx) int32 arrays: node n's ArtNet neighbours are
+    nbr_idx[nbr_ptr[n]:nbr_ptr[n + 1]], in first-seen edge order with
+    duplicates dropped, matching the tuple-keyed neighbour dict.
+    """
+    neighbor_lists: List[List[int]] = [[] for _ in range(n_nodes)]
+    for start_id, end_id in edge_ids:
+        if is_artnet[start_id] and start_id not in neighbor_lists[end_id]:
+            neighbor_lists[end_id].append(start_id)
+        if is_artnet[end_id] and end_id not in neighbor_lists[start_id]:
+            neighbor_lists[start_id].append(end_id)
+
+    nbr_ptr = np.zeros(n_nodes + 1, dtype=np.int32)
+    for n, neighbors in enumerate(neighbor_lists):
+        nbr_ptr[n + 1] = nbr_ptr[n] + len(neighbors)
+    nbr_idx = np.empty(int(nbr_ptr[-1]), dtype=np.int32)
+    for n, neighbors in enumerate(neighbor_lists):
+        base = int(nbr_ptr[n])
+        for j, neighbor in enumerate(neighbors):
+            nbr_idx[base + j] = neighbor
+    return nbr_ptr, nbr_idx
+
+
 def balance_row_power_and_ports(edges: List[Tuple[Tuple[float, float, float], Tuple[float, float, float]]],
                                 artnet_nodes: List[Tuple[float, float, float]],
                                 edge_directions: Dict,
                                 max_amps_per_row: int = 20,
                                 max_outputs_per_node: int = 4,
-                                max_iterations: int = 1000) -> Dict:
+                                max_iterations: int = 1000,
+                                verbose: bool = False) -> Dict:
     """
     Balance edge directions to satisfy BOTH row power (≤20A) and node port (≤4) constraints.
     
@@ -521,368 +1037,491 @@ def balance_row_power_and_ports(edges: List[Tuple[Tuple[float, float, float], Tu
         max_amps_per_row: Maximum amps per row (default 20)
         max_outputs_per_node: Maximum outputs per node (default 4)
         max_iterations: Maximum optimization iterations
+        verbose: Print optimization progress
         
     Returns:
         Dictionary with balanced edge_directions and violation stats
     """
-    import copy
-    
+    vprint = print if verbose else (lambda *args, **kwargs: None)
     artnet_set = set(artnet_nodes)
-    edge_dirs = copy.deepcopy(edge_directions)
-    
-    print(f"\n{'='*70}")
-    print("DUAL-CONSTRAINT OPTIMIZATION: Row Power (≤{max_amps_per_row}A) + Node Ports (≤{max_outputs_per_node})")
-    print(f"{'='*70}")
+    # Values are immutable (tuple, tuple) pairs, so a shallow copy is enough
+    edge_dirs = dict(edge_directions)
     
-    def calculate_row_power():
-        """Calculate amp usage per row (Y coordinate)"""
-        row_amps = {}
-        for edge in edges:
-            data_start, data_end = edge_dirs.get(edge, (None, None))
-            if data_start:
-                row_y = data_start[1]  # Y coordinate of source ArtNet node
-                row_amps[row_y] = row_amps.get(row_y, 0) + 1  # 1 amp per edge
-        return row_amps
-    
-    def calculate_node_outputs():
-        """Calculate output count per ArtNet node"""
-        node_outputs = {node: 0 for node in artnet_nodes}
-        for edge in edges:
-            data_start, data_end = edge_dirs.get(edge, (None, None))
-            if data_start in artnet_set:
-                node_outputs[data_start] += 1
-        return node_outputs
-    
-    def get_violations():
-        """Get current constraint violations"""
-        row_amps = calculate_row_power()
-        node_outputs = calculate_node_outputs()
-        
-        row_violations = [(y, amps) for y, amps in row_amps.items() if amps > max_amps_per_row]
-        node_violations = [(node, count) for node, count in node_outputs.items() if count > max_outputs_per_node]
-        
-        return row_violations, node_violations, row_amps, node_outputs
-    
-    # Build node connectivity for finding alternatives
-    node_to_artnet_neighbors = {}
+    vprint(f"\n{'='*70}")
+    vprint("DUAL-CONSTRAINT OPTIMIZATION: Row Power (≤{max_amps_per_row}A) + Node Ports (≤{max_outputs_per_node})")
+    vprint(f"{'='*70}")
+
+    # Integer-id mirror of the network so the counting kernels run compiled
+    node_list = []
+    node_index = {}
     for edge in edges:
-        start, end = edge
-        if start in artnet_set:
-            if end not in node_to_artnet_neighbors:
-                node_to_artnet_neighbors[end] = []
-            if start not in node_to_artnet_neighbors[end]:
-                node_to_artnet_neighbors[end].append(start)
-        if end in artnet_set:
-            if start not in node_to_artnet_neighbors:
-                node_to_artnet_neighbors[start] = []
-            if end not in node_to_artnet_neighbors[start]:
-                node_to_artnet_neighbors[start].append(end)
-    
-    # Iterative optimization - Phase 1: Satisfy hard constraints
-    iteration = 0
-    improvements = 0
-    phase = 1
-    best_max_row = float('inf')
-    iterations_without_max_improvement = 0
-    
-    while iteration < max_iterations:
-        row_violations, node_violations, row_amps, node_outputs = get_violations()
-        
-        # Phase transitions
-        if phase == 1 and not row_violations and not node_violations:
-            print(f"✅ Hard constraints satisfied after {iteration} iterations!")
-            print(f"\nPhase 2: Balancing power across rows (redirections)...")
-            phase = 2
-            best_max_row = max(row_amps.values()) if row_amps else float('inf')
-            iterations_without_max_improvement = 0
-            continue
-        elif phase == 2 and iterations_without_max_improvement >= 30:
-            print(f"\nPhase 3: Aggressive balancing (edge reversals)...")
-            phase = 3
-            best_max_row = max(row_amps.values()) if row_amps else float('inf')
-            iterations_without_max_improvement = 0
-            continue
-        
-        if iteration % 100 == 0 and phase == 1:
-            print(f"  Iteration {iteration}: {len(row_violations)} row violations, {len(node_violations)} node violations")
-        elif iteration % 100 == 0 and phase in [2, 3]:
-            max_row = max(row_amps.values()) if row_amps else 0
-            avg_row = sum(row_amps.values()) / len(row_amps) if row_amps else 0
-            print(f"  Iteration {iteration}: Max row={max_row}A, Avg={avg_row:.1f}A")
-        
-        # Track if max row power is improving (Phases 2 & 3)
-        if phase in [2, 3] and row_amps:
-            current_max_row = max(row_amps.values())
-            if current_max_row < best_max_row:
-                best_max_row = current_max_row
-                iterations_without_max_improvement = 0
-            else:
-                iterations_without_max_improvement += 1
-            
-            # Phase 2: Move to Phase 3 after 30 iterations without improvement
-            # Phase 3: Stop after 50 iterations without improvement
-            max_wait = 30 if phase == 2 else 50
-            if phase == 3 and iterations_without_max_improvement >= max_wait:
-                print(f"  No more improvements possible")
+        for node in edge:
+            if node not in node_index:
+                node_index[node] = len(node_list)
+                node_list.append(node)
+    for node in artnet_nodes:
+        if node not in node_index:
+            node_index[node] = len(node_list)
+            node_list.append(node)
+
+    n_nodes = len(node_list)
+    is_artnet = np.zeros(n_nodes, dtype=np.uint8)
+    for node in artnet_nodes:
+        is_artnet[node_index[node]] = 1
+
+    # Compact row ids, assigned in ascending Y order. node_row maps each
+    # node tuple to its row id so the hot loops never index tuples or hash
+    # float Y keys; row_values translates ids back for reporting.
+    row_values = sorted({node[1] for node in node_list})
+    row_index = {y: i for i, y in enumerate(row_values)}
+    node_row = {node: row_index[node[1]] for node in node_list}
+    row_of_node = np.array([node_row[node] for node in node_list], dtype=np.int32)
+
+    # dir_src[i] is the compact id of edge i's data source (-1 for no flow),
+    # kept in sync with edge_dirs at every direction change
+    edge_index = {edge: i for i, edge in enumerate(edges)}
+    dir_src = np.full(len(edges), -1, dtype=np.int32)
+    for edge, (data_start, _) in edge_dirs.items():
+        if data_start is not None and edge in edge_index:
+            dir_src[edge_index[edge]] = node_index[data_start]
+
+    # Counters are built once and maintained incrementally by reassign();
+    # each iteration only flips O(1) edges, so no per-iteration recount.
+    # Row amps live in a flat array indexed by row id while balancing and
+    # are only turned back into a Y-keyed dict for the final report.
+    row_amps_arr = _count_row_amps(dir_src, row_of_node, len(row_values))
+    node_counts0 = _count_node_outputs(dir_src, is_artnet, n_nodes)
+    node_outputs = {node: int(node_counts0[node_index[node]]) for node in artnet_nodes}
+
+    # Inverted indices over the current directions: which edges start at a
+    # given node / in a given row. Inner dicts act as insertion-ordered sets.
+    # The reversible bucket holds only ArtNet-to-ArtNet edges, the only ones
+    # Phase 3 may flip, so its scan never touches unreversible edges.
+    edges_by_start_node = defaultdict(dict)
+    edges_by_start_row = defaultdict(dict)
+    reversible_edges_by_start_row = defaultdict(dict)
+    for edge, (data_start, data_end) in edge_dirs.items():
+        if data_start is not None:
+            edges_by_start_node[data_start][edge] = None
+            edges_by_start_row[node_row[data_start]][edge] = None
+            if data_start in artnet_set and data_end in artnet_set:
+                reversible_edges_by_start_row[node_row[data_start]][edge] = None
+
+    # Lazy max-heap over row loads: stale entries are skipped on read, so
+    # each update is O(log R) instead of re-scanning every row for the max
+    row_heap = [(-int(amps), r) for r, amps in enumerate(row_amps_arr) if amps > 0]
+    heapq.heapify(row_heap)
+
+    def peek_max_row():
+        """Current maximum row load (0 when no row is powered)."""
+        while row_heap:
+            neg_amps, r = row_heap[0]
+            if row_amps_arr[r] == -neg_amps:
+                return -neg_amps
+            heapq.heappop(row_heap)
+        return 0
+
+    def rows_by_load_desc():
+        """Yield (row id, amps) from the most to the least loaded row."""
+        heap_copy = list(row_heap)
+        seen = set()
+        while heap_copy:
+            neg_amps, r = heapq.heappop(heap_copy)
+            if neg_amps == 0:
                 break
-        
-        made_improvement = False
-        
-        # Phase 2: Balance power across rows (reduce peak usage and variance)
-        if phase == 2:
-            if row_amps:
-                # Calculate average and find rows above average
-                avg_amps = sum(row_amps.values()) / len(row_amps)
-                max_row_amps = max(row_amps.values())
-                
-                # Sort rows by load (highest first)
-                sorted_by_load = sorted(row_amps.items(), key=lambda x: x[1], reverse=True)
-                
-                # Try to move edges from high-load rows to lower-load rows
-                for high_row_y, high_amps in sorted_by_load:
-                    # Only consider rows above average or at max
-                    if high_amps <= avg_amps and high_amps < max_row_amps:
-                        continue
-                    
-                    # Find all rows sorted by Y coordinate
-                    sorted_rows = sorted(row_amps.keys())
-                    row_idx = sorted_rows.index(high_row_y)
-                    
-                    # Consider neighboring rows (immediate neighbors first, then expand)
-                    neighbor_rows = []
-                    if row_idx > 0:
-                        neighbor_rows.append(sorted_rows[row_idx - 1])
-                    if row_idx < len(sorted_rows) - 1:
-                        neighbor_rows.append(sorted_rows[row_idx + 1])
-                    
-                    # Find edges powered from this row
-                    edges_in_row = []
-                    for edge in edges:
-                        data_start, data_end = edge_dirs.get(edge, (None, None))
-                        if data_start and data_start[1] == high_row_y:
-                            edges_in_row.append(edge)
-                    
-                    # Try to move edges to less-loaded neighboring rows
-                    for edge in edges_in_row:
-                        data_start, data_end = edge_dirs.get(edge, (None, None))
-                        
-                        if data_end in node_to_artnet_neighbors:
-                            # Sort alternative ArtNet nodes by their row load (prefer less loaded rows)
-                            alt_options = []
-                            for alt_artnet in node_to_artnet_neighbors[data_end]:
-                                if alt_artnet == data_start:
-                                    continue
-                                alt_row = alt_artnet[1]
-                                alt_row_amps = row_amps.get(alt_row, 0)
-                                alt_node_outputs = node_outputs.get(alt_artnet, 0)
-                                
-                                # Check constraints
-                                if alt_row_amps < max_amps_per_row and alt_node_outputs < max_outputs_per_node:
-                                    # Prioritize neighboring rows
-                                    priority = 0
-                                    if alt_row in neighbor_rows:
-                                        priority = 100
-                                    # Prefer rows with lower load
-                                    priority -= alt_row_amps
-                                    alt_options.append((priority, alt_artnet, alt_row, alt_row_amps))
-                            
-                            # Sort by priority (highest first)
-                            alt_options.sort(key=lambda x: x[0], reverse=True)
-                            
-                            # Try the best option
-                            for priority, alt_artnet, alt_row, alt_row_amps in alt_options:
-                                # Only move if it improves balance (reduces max or reduces variance)
-                                if alt_row_amps < high_amps:
-                                    edge_dirs[edge] = (alt_artnet, data_end)
-                                    row_amps[high_row_y] -= 1
-                                    row_amps[alt_row] += 1
-                                    node_outputs[data_start] -= 1
-                                    node_outputs[alt_artnet] += 1
-                                    improvements += 1
-                                    made_improvement = True
-                                    break
-                        
-                        if made_improvement:
-                            break
-                    
-                    if made_improvement:
-                        break
-        
-        # Phase 3: Try direct edge reversals for aggressive balancing
-        if phase == 3 and not made_improvement:
-            if row_amps:
-                max_row_amps = max(row_amps.values())
-                sorted_by_load = sorted(row_amps.items(), key=lambda x: x[1], reverse=True)
-                
-                # Try reversing edges from high-load rows
-                for high_row_y, high_amps in sorted_by_load:
-                    if high_amps < max_row_amps:
-                        continue
-                    
-                    # Find edges where data flows FROM this row
-                    edges_from_row = []
-                    for edge in edges:
-                        data_start, data_end = edge_dirs.get(edge, (None, None))
-                        if data_start and data_start[1] == high_row_y:
-                            edges_from_row.append((edge, data_start, data_end))
-                    
-                    # Try to reverse each edge
-                    for edge, data_start, data_end in edges_from_row:
-                        # Check if both endpoints are ArtNet nodes (required for reversal)
-                        if data_start not in artnet_set or data_end not in artnet_set:
-                            continue
-                        
-                        # Calculate impact of reversal
-                        target_row = data_end[1]
-                        target_row_amps = row_amps.get(target_row, 0)
-                        target_node_outputs = node_outputs.get(data_end, 0)
-                        source_node_outputs = node_outputs.get(data_start, 0)
-                        
-                        # Only reverse if:
-                        # 1. Target row has capacity (< 20A after adding this edge)
-                        # 2. Target node has capacity (< 4 outputs after adding)
-                        # 3. It reduces max row power OR balances better
-                        if (target_row_amps < max_amps_per_row and 
-                            target_node_outputs < max_outputs_per_node and
-                            target_row_amps < high_amps):
-                            
-                            # Reverse the edge
-                            edge_dirs[edge] = (data_end, data_start)
-                            row_amps[high_row_y] -= 1
-                            row_amps[target_row] += 1
-                            node_outputs[data_start] -= 1
-                            node_outputs[data_end] += 1
+            if r in seen or row_amps_arr[r] != -neg_amps:
+                continue
+            seen.add(r)
+            yield r, -neg_amps
+
+    # Violations are tracked as sets and flipped only when a touched row or
+    # node crosses its limit, so the per-iteration check is O(violations)
+    row_violation_set = {int(r) for r in np.nonzero(row_amps_arr > max_amps_per_row)[0]}
+    node_violation_set = {node for node, count in node_outputs.items()
+                          if count > max_outputs_per_node}
+
+    def reassign(edge, new_src, new_dst):
+        """Repoint an edge's data source, updating counters and indices by delta."""
+        old_src, _ = edge_dirs[edge]
+        edge_dirs[edge] = (new_src, new_dst)
+        dir_src[edge_index[edge]] = node_index[new_src]
+
+        if old_src is not None:
+            old_row = node_row[old_src]
+            row_amps_arr[old_row] -= 1
+            if row_amps_arr[old_row] <= max_amps_per_row:
+                row_violation_set.discard(old_row)
+            if old_src in node_outputs:
+                node_outputs[old_src] -= 1
+                row_free_ports[old_row] += 1
+                if node_outputs[old_src] <= max_outputs_per_node:
+                    node_violation_set.discard(old_src)
+            edges_by_start_node[old_src].pop(edge, None)
+            edges_by_start_row[old_row].pop(edge, None)
+            reversible_edges_by_start_row[old_row].pop(edge, None)
+            heapq.heappush(row_heap, (-int(row_amps_arr[old_row]), old_row))
+
+        new_row = node_row[new_src]
+        row_amps_arr[new_row] += 1
+        if row_amps_arr[new_row] > max_amps_per_row:
+            row_violation_set.add(new_row)
+        if new_src in node_outputs:
+            node_outputs[new_src] += 1
+            row_free_ports[new_row] -= 1
+            if node_outputs[new_src] > max_outputs_per_node:
+                node_violation_set.add(new_src)
+        edges_by_start_node[new_src][edge] = None
+        edges_by_start_row[new_row][edge] = None
+        if new_src in artnet_set and new_dst in artnet_set:
+            reversible_edges_by_start_row[new_row][edge] = None
+        heapq.heappush(row_heap, (-int(row_amps_arr[new_row]), new_row))
+
+    if njit is not None:
+        # Compiled path: run the whole phased loop over the int-id mirror.
+        # The ArtNet-neighbour connectivity goes straight into CSR arrays
+        # without detouring through a tuple-keyed dict.
+        edge_dst_arr = np.full(len(edges), -1, dtype=np.int32)
+        for edge, (data_start, data_end) in edge_dirs.items():
+            if data_start is not None and edge in edge_index:
+                edge_dst_arr[edge_index[edge]] = node_index[data_end]
+
+        edge_ids = [(node_index[start], node_index[end]) for start, end in edges]
+        nbr_ptr, nbr_idx = _artnet_neighbors_csr(edge_ids, is_artnet, n_nodes)
+        artnet_order = np.array([node_index[node] for node in artnet_nodes], dtype=np.int32)
+
+        global _balance_order_buf
+        if _balance_order_buf.shape[0] < len(row_values):
+            _balance_order_buf = np.empty(len(row_values), dtype=np.int32)
+
+        iteration, improvements = _balance_phases(
+            dir_src, edge_dst_arr, row_of_node, is_artnet,
+            nbr_ptr, nbr_idx, artnet_order, len(row_values),
+            max_amps_per_row, max_outputs_per_node, max_iterations,
+            _balance_order_buf)
+
+        # Translate the id arrays back to coordinate-tuple directions
+        for edge, i in edge_index.items():
+            if dir_src[i] >= 0:
+                edge_dirs[edge] = (node_list[dir_src[i]], node_list[edge_dst_arr[i]])
+    else:
+        # Build node connectivity for finding alternatives
+        node_to_artnet_neighbors = {}
+        for edge in edges:
+            start, end = edge
+            if start in artnet_set:
+                if end not in node_to_artnet_neighbors:
+                    node_to_artnet_neighbors[end] = []
+                if start not in node_to_artnet_neighbors[end]:
+                    node_to_artnet_neighbors[end].append(start)
+            if end in artnet_set:
+                if start not in node_to_artnet_neighbors:
+                    node_to_artnet_neighbors[start] = []
+                if end not in node_to_artnet_neighbors[start]:
+                    node_to_artnet_neighbors[start].append(end)
+
+        def try_redirect(edge):
+            """Repoint edge to the first alternate ArtNet feed with row and
+            port capacity; True on success. Shared by both Phase-1 fixes."""
+            # Edges reaching here come from the inverted indices, which only
+            # ever hold directed entries, so index without a default
+            data_start, data_end = edge_dirs[edge]
+            if data_end not in node_to_artnet_neighbors:
+                return False
+            for alt_artnet in node_to_artnet_neighbors[data_end]:
+                if alt_artnet == data_start:
+                    continue
+                alt_row = node_row[alt_artnet]
+                if (row_amps_arr[alt_row] < max_amps_per_row and
+                        node_outputs.get(alt_artnet, 0) < max_outputs_per_node):
+                    reassign(edge, alt_artnet, data_end)
+                    return True
+            return False
+
+        # Rows holding at least one ArtNet node - the only possible Phase-2
+        # targets, so their minimum load bounds what a move can achieve
+        artnet_rows = np.array(sorted({node_row[node] for node in artnet_set}),
+                               dtype=np.int64)
+
+        # Spare output ports summed per row: a row at zero cannot accept any
+        # move, so Phase 2 can drop its candidates before the dict probes
+        row_free_ports = np.zeros(len(row_values), dtype=np.int32)
+        for node in artnet_nodes:
+            row_free_ports[node_row[node]] += max_outputs_per_node - node_outputs[node]
+
+        # Iterative optimization - Phase 1: Satisfy hard constraints
+        iteration = 0
+        improvements = 0
+        phase = 1
+        best_max_row = float('inf')
+        iterations_without_max_improvement = 0
+
+        # Scratch lists reused across iterations instead of reallocating;
+        # the row-fix buffer is separate because Phase 1 re-reads it on
+        # iterations where no row violation refills it
+        row_violations = []
+        node_violations = []
+        edges_buf = []
+        edges_in_row = []
+        reversal_buf = []
+
+        def _phase2_step():
+            # Phase 2: Balance power across rows (reduce peak usage and variance)
+            nonlocal improvements
+            max_row_amps = peek_max_row()
+            if max_row_amps <= 0:
+                return False
+            # Average load over the powered rows
+            powered = row_amps_arr[row_amps_arr > 0]
+            avg_amps = powered.sum() / powered.size
+            min_artnet_row_amps = int(row_amps_arr[artnet_rows].min())
+
+            # Try to move edges from high-load rows to lower-load rows
+            for high_row_y, high_amps in rows_by_load_desc():
+                if high_amps <= min_artnet_row_amps:
+                    # Every candidate feed row is at least this loaded,
+                    # so no strict improvement exists from here on down
+                    break
+                # Only consider rows above average or at max
+                if high_amps <= avg_amps and high_amps < max_row_amps:
+                    continue
+
+                # Find all rows sorted by Y coordinate
+                sorted_rows = [int(r) for r in np.nonzero(row_amps_arr)[0]]
+                row_idx = sorted_rows.index(high_row_y)
+
+                # Consider neighboring rows (immediate neighbors first, then expand)
+                neighbor_rows = []
+                if row_idx > 0:
+                    neighbor_rows.append(sorted_rows[row_idx - 1])
+                if row_idx < len(sorted_rows) - 1:
+                    neighbor_rows.append(sorted_rows[row_idx + 1])
+
+                # Find edges powered from this row
+                edges_buf.clear()
+                edges_buf.extend(edges_by_start_row.get(high_row_y, ()))
+
+                # Try to move edges to less-loaded neighboring rows
+                for edge in edges_buf:
+                    data_start, data_end = edge_dirs[edge]
+
+                    if data_end in node_to_artnet_neighbors:
+                        # Single pass over the alternatives: only the
+                        # top-priority acceptable feed is ever used,
+                        # so track a running best instead of sorting
+                        best_priority = None
+                        best_artnet = None
+                        for alt_artnet in node_to_artnet_neighbors[data_end]:
+                            if alt_artnet == data_start:
+                                continue
+                            alt_row = node_row[alt_artnet]
+                            if row_free_ports[alt_row] <= 0:
+                                # No ArtNet node in this row has a
+                                # spare output
+                                continue
+                            alt_row_amps = int(row_amps_arr[alt_row])
+                            alt_node_outputs = node_outputs.get(alt_artnet, 0)
+
+                            # Check constraints; only moves that improve
+                            # balance (reduce the peak) are acceptable
+                            if (alt_row_amps >= max_amps_per_row or
+                                    alt_node_outputs >= max_outputs_per_node or
+                                    alt_row_amps >= high_amps):
+                                continue
+                            # Prioritize neighboring rows, then lower load
+                            priority = 100 if alt_row in neighbor_rows else 0
+                            priority -= alt_row_amps
+                            if best_priority is None or priority > best_priority:
+                                best_priority = priority
+                                best_artnet = alt_artnet
+
+                        if best_artnet is not None:
+                            reassign(edge, best_artnet, data_end)
                             improvements += 1
-                            made_improvement = True
-                            break
-                    
-                    if made_improvement:
-                        break
-        
-        # Phase 1: Try to fix hard constraint violations
-        if phase == 1 and not made_improvement:
-            # Try to fix row violations
+                            return True
+            return False
+
+        def _phase3_step():
+            # Phase 3: Try direct edge reversals for aggressive balancing
+            nonlocal improvements
+            max_row_amps = peek_max_row()
+            if max_row_amps <= 0:
+                return False
+
+            # Try reversing edges from high-load rows
+            for high_row_y, high_amps in rows_by_load_desc():
+                if high_amps < max_row_amps:
+                    continue
+
+                # Reversible (ArtNet-to-ArtNet) edges flowing FROM this row
+                reversal_buf.clear()
+                reversal_buf.extend((edge, *edge_dirs[edge])
+                                    for edge in reversible_edges_by_start_row.get(high_row_y, ()))
+
+                # Try to reverse each edge
+                for edge, data_start, data_end in reversal_buf:
+                    # Calculate impact of reversal
+                    target_row = node_row[data_end]
+                    target_row_amps = int(row_amps_arr[target_row])
+                    target_node_outputs = node_outputs.get(data_end, 0)
+
+                    # Only reverse if:
+                    # 1. Target row has capacity (< 20A after adding this edge)
+                    # 2. Target node has capacity (< 4 outputs after adding)
+                    # 3. It reduces max row power OR balances better
+                    if (target_row_amps < max_amps_per_row and
+                        target_node_outputs < max_outputs_per_node and
+                        target_row_amps < high_amps):
+
+                        # Reverse the edge
+                        reassign(edge, data_end, data_start)
+                        improvements += 1
+                        return True
+            return False
+
+        def _phase1_row_step():
+            # Phase 1: Try to fix hard row-power violations
+            nonlocal improvements
             for row_y, amps in row_violations:
                 if amps <= max_amps_per_row:
                     continue
-                
+
                 # Find edges powered by this row
-                edges_in_row = []
-                for edge in edges:
-                    data_start, data_end = edge_dirs.get(edge, (None, None))
-                    if data_start and data_start[1] == row_y:
-                        edges_in_row.append(edge)
-            
+                edges_in_row.clear()
+                edges_in_row.extend(edges_by_start_row.get(row_y, ()))
+
             # Try to redirect edges to different rows
             for edge in edges_in_row:
-                data_start, data_end = edge_dirs.get(edge, (None, None))
-                
-                # Find alternative ArtNet nodes for this edge
-                if data_end in node_to_artnet_neighbors:
-                    for alt_artnet in node_to_artnet_neighbors[data_end]:
-                        if alt_artnet == data_start:
-                            continue
-                        
-                        # Check constraints
-                        alt_row = alt_artnet[1]
-                        alt_row_amps = row_amps.get(alt_row, 0)
-                        alt_node_outputs = node_outputs.get(alt_artnet, 0)
-                        
-                        # Check if this flip would satisfy constraints
-                        if alt_row_amps < max_amps_per_row and alt_node_outputs < max_outputs_per_node:
-                            # Make the flip
-                            edge_dirs[edge] = (alt_artnet, data_end)
-                            row_amps[row_y] -= 1
-                            row_amps[alt_row] = row_amps.get(alt_row, 0) + 1
-                            node_outputs[data_start] -= 1
-                            node_outputs[alt_artnet] += 1
-                            improvements += 1
-                            made_improvement = True
-                            break
-                
-                    if made_improvement:
-                        break
-                
-                if made_improvement:
-                    break
-        
-        if phase == 1 and not made_improvement:
-            # Try to fix node violations
+                if try_redirect(edge):
+                    improvements += 1
+                    return True
+            return False
+
+        def _phase1_node_step():
+            # Phase 1: Try to fix node fan-out violations
+            nonlocal improvements
             for node, count in node_violations:
                 if count <= max_outputs_per_node:
                     continue
-                
+
                 # Find edges from this node
-                node_edges = []
-                for edge in edges:
-                    data_start, data_end = edge_dirs.get(edge, (None, None))
-                    if data_start == node:
-                        node_edges.append(edge)
-                
+                edges_buf.clear()
+                edges_buf.extend(edges_by_start_node.get(node, ()))
+
                 # Try to redirect edges
-                for edge in node_edges:
-                    data_start, data_end = edge_dirs.get(edge, (None, None))
-                    
-                    if data_end in node_to_artnet_neighbors:
-                        for alt_artnet in node_to_artnet_neighbors[data_end]:
-                            if alt_artnet == data_start:
-                                continue
-                            
-                            alt_row = alt_artnet[1]
-                            alt_row_amps = row_amps.get(alt_row, 0)
-                            alt_node_outputs = node_outputs.get(alt_artnet, 0)
-                            
-                            if alt_row_amps < max_amps_per_row and alt_node_outputs < max_outputs_per_node:
-                                edge_dirs[edge] = (alt_artnet, data_end)
-                                row_amps[data_start[1]] -= 1
-                                row_amps[alt_row] = row_amps.get(alt_row, 0) + 1
-                                node_outputs[data_start] -= 1
-                                node_outputs[alt_artnet] += 1
-                                improvements += 1
-                                made_improvement = True
-                                break
-                    
-                    if made_improvement:
-                        break
-                
-                if made_improvement:
+                for edge in edges_buf:
+                    if try_redirect(edge):
+                        improvements += 1
+                        return True
+            return False
+
+
+        while iteration < max_iterations:
+            row_violations.clear()
+            row_violations.extend((r, int(row_amps_arr[r])) for r in row_violation_set)
+            node_violations.clear()
+            node_violations.extend((node, node_outputs[node]) for node in node_violation_set)
+        
+            # Phase transitions
+            if phase == 1 and not row_violations and not node_violations:
+                vprint(f"✅ Hard constraints satisfied after {iteration} iterations!")
+                vprint(f"\nPhase 2: Balancing power across rows (redirections)...")
+                phase = 2
+                best_max_row = peek_max_row() or float('inf')
+                iterations_without_max_improvement = 0
+                continue
+            elif phase == 2 and iterations_without_max_improvement >= 30:
+                vprint(f"\nPhase 3: Aggressive balancing (edge reversals)...")
+                phase = 3
+                best_max_row = peek_max_row() or float('inf')
+                iterations_without_max_improvement = 0
+                continue
+        
+            if iteration % 100 == 0 and phase == 1:
+                vprint(f"  Iteration {iteration}: {len(row_violations)} row violations, {len(node_violations)} node violations")
+            elif iteration % 100 == 0 and phase in [2, 3]:
+                max_row = peek_max_row()
+                powered = row_amps_arr[row_amps_arr > 0]
+                avg_row = powered.mean() if powered.size else 0
+                vprint(f"  Iteration {iteration}: Max row={max_row}A, Avg={avg_row:.1f}A")
+        
+            # Track if max row power is improving (Phases 2 & 3)
+            current_max_row = peek_max_row()
+            if phase in [2, 3] and current_max_row > 0:
+                if current_max_row < best_max_row:
+                    best_max_row = current_max_row
+                    iterations_without_max_improvement = 0
+                else:
+                    iterations_without_max_improvement += 1
+            
+                # Phase 2: Move to Phase 3 after 30 iterations without improvement
+                # Phase 3: Stop after 50 iterations without improvement
+                max_wait = 30 if phase == 2 else 50
+                if phase == 3 and iterations_without_max_improvement >= max_wait:
+                    vprint(f"  No more improvements possible")
                     break
         
-        if not made_improvement:
-            if phase == 1:
-                print(f"  Cannot resolve all violations after {iteration} iterations")
-                break
-            elif phase == 2:
-                # Phase 2: No more balancing improvements possible
-                print(f"  Power distribution balanced after {iteration} iterations")
-                break
+            # Flat phase dispatch: each step helper returns the moment it
+            # lands one improvement, replacing the nested made_improvement
+            # checks the break-cascades used to re-test at every level
+            if phase == 2:
+                made_improvement = _phase2_step()
+            elif phase == 3:
+                made_improvement = _phase3_step()
+            else:
+                made_improvement = _phase1_row_step() or _phase1_node_step()
+            if not made_improvement:
+                if phase == 1:
+                    vprint(f"  Cannot resolve all violations after {iteration} iterations")
+                    break
+                elif phase == 2:
+                    # Phase 2: No more balancing improvements possible
+                    vprint(f"  Power distribution balanced after {iteration} iterations")
+                    break
         
-        iteration += 1
-    
-    # Final report
-    row_violations, node_violations, row_amps, node_outputs = get_violations()
+            iteration += 1
     
-    print(f"\n{'='*70}")
-    print("DUAL-CONSTRAINT OPTIMIZATION COMPLETE")
-    print(f"{'='*70}")
-    print(f"Iterations: {iteration}")
-    print(f"Improvements: {improvements}")
-    print(f"\nRow Power:")
-    print(f"  Max row: {max(row_amps.values())}A (limit: {max_amps_per_row}A)")
-    print(f"  Violations: {len(row_violations)} rows exceed limit")
+    # Final report, summarised straight from the id-space counters; the
+    # Y- and node-keyed dicts are only rebuilt for the return payload
+    row_counts = _count_row_amps(dir_src, row_of_node, len(row_values))
+    node_counts = _count_node_outputs(dir_src, is_artnet, n_nodes)
+    artnet_ids = np.array([node_index[node] for node in artnet_nodes], dtype=np.int64)
+    artnet_counts = node_counts[artnet_ids]
+
+    row_amps = {row_values[r]: int(c) for r, c in enumerate(row_counts) if c > 0}
+    node_outputs = {node: int(artnet_counts[i]) for i, node in enumerate(artnet_nodes)}
+
+    viol_rows = np.nonzero(row_counts > max_amps_per_row)[0]
+    row_violations = [(row_values[int(r)], int(row_counts[r])) for r in viol_rows]
+    viol_nodes = np.nonzero(artnet_counts > max_outputs_per_node)[0]
+    node_violations = [(artnet_nodes[int(i)], int(artnet_counts[i])) for i in viol_nodes]
+
+    vprint(f"\n{'='*70}")
+    vprint("DUAL-CONSTRAINT OPTIMIZATION COMPLETE")
+    vprint(f"{'='*70}")
+    vprint(f"Iterations: {iteration}")
+    vprint(f"Improvements: {improvements}")
+    vprint(f"\nRow Power:")
+    vprint(f"  Max row: {int(row_counts.max()) if row_counts.size else 0}A (limit: {max_amps_per_row}A)")
+    vprint(f"  Violations: {len(row_violations)} rows exceed limit")
     if row_violations:
-        for row_y, amps in sorted(row_violations, key=lambda x: -x[1])[:5]:
-            print(f"    Y={row_y:.1f}: {amps}A (excess: {amps - max_amps_per_row}A)")
-    
-    print(f"\nNode Ports:")
-    print(f"  Max outputs: {max(node_outputs.values())} (limit: {max_outputs_per_node})")
-    print(f"  Violations: {len(node_violations)} nodes exceed limit")
+        k = min(5, viol_rows.size)
+        top = viol_rows[np.argpartition(-row_counts[viol_rows], k - 1)[:k]]
+        for r in top[np.argsort(-row_counts[top], kind='stable')]:
+            amps = int(row_counts[r])
+            vprint(f"    Y={row_values[int(r)]:.1f}: {amps}A (excess: {amps - max_amps_per_row}A)")
+
+    vprint(f"\nNode Ports:")
+    vprint(f"  Max outputs: {int(artnet_counts.max()) if artnet_counts.size else 0} (limit: {max_outputs_per_node})")
+    vprint(f"  Violations: {len(node_violations)} nodes exceed limit")
     if node_violations:
-        for node, count in sorted(node_violations, key=lambda x: -x[1])[:5]:
-            print(f"    Node {node}: {count} outputs (excess: {count - max_outputs_per_node})")
+        k = min(5, viol_nodes.size)
+        top = viol_nodes[np.argpartition(-artnet_counts[viol_nodes], k - 1)[:k]]
+        for i in top[np.argsort(-artnet_counts[top], kind='stable')]:
+            count = int(artnet_counts[i])
+            vprint(f"    Node {artnet_nodes[int(i)]}: {count} outputs (excess: {count - max_outputs_per_node})")
     
     if not row_violations and not node_violations:
-        print(f"\n✅ All constraints satisfied!")
+        vprint(f"\n✅ All constraints satisfied!")
     
     return {
         'edge_directions': edge_dirs,
@@ -895,7 +1534,8 @@ def balance_row_power_and_ports(edges: List[Tuple[Tuple[float, float, float], Tu
 
 def optimize_led_network(nodes: Set[Tuple[float, float, float]], 
                         edges: List[Tuple[Tuple[float, float, float], Tuple[float, float, float]]], 
-                        num_artnet_nodes: int = None) -> Dict:
+                        num_artnet_nodes: int = None,
+                        verbose: bool = False) -> Dict:
     """
     Main function to optimize ArtNet distribution for LED network.
     
@@ -903,16 +1543,19 @@ def optimize_led_network(nodes: Set[Tuple[float, float, float]],
         nodes: Set of node coordinates
         edges: List of edge tuples
         num_artnet_nodes: Number of ArtNet nodes to place
+        verbose: Print optimization progress
         
     Returns:
         Optimization results dictionary
     """
+    vprint = print if verbose else (lambda *args, **kwargs: None)
+
     optimizer = ArtNetOptimizer(nodes, edges)
-    result = optimizer.optimize_artnet_distribution(num_artnet_nodes)
+    result = optimizer.optimize_artnet_distribution(num_artnet_nodes, verbose=verbose)
     
     # Balance edge directions to respect 4-port limit
-    print("\nBalancing edge directions (4-port limit per ArtNet node)...")
-    direction_result = balance_edge_directions(edges, result['artnet_nodes'])
+    vprint("\nBalancing edge directions (4-port limit per ArtNet node)...")
+    direction_result = balance_edge_directions(edges, result['artnet_nodes'], verbose=verbose)
     
     # Further optimize to balance BOTH row power and node ports
     dual_result = balance_row_power_and_ports(
@@ -920,7 +1563,8 @@ def optimize_led_network(nodes: Set[Tuple[float, float, float]],
         result['artnet_nodes'],
         direction_result['edge_directions'],
         max_amps_per_row=20,
-        max_outputs_per_node=4
+        max_outputs_per_node=4,
+        verbose=verbose
     )
     
     # Add direction information to result (using dual-optimized directions)
@@ -940,7 +1584,7 @@ if __name__ == "__main__":
                    ((0, 0, 0), (0, 1, 0)), ((1, 0, 0), (1, 1, 0)), ((2, 0, 0), (2, 1, 0)),
                    ((0, 1, 0), (1, 1, 0)), ((1, 1, 0), (2, 1, 0))]
     
-    result = optimize_led_network(sample_nodes, sample_edges)
+    result = optimize_led_network(sample_nodes, sample_edges, verbose=True)
     print("Optimization Results:")
     print(f"ArtNet Nodes: {result['artnet_nodes']}")
     print(f"End Nodes: {len(result['end_nodes'])}")
@@ -1,15 +1,76 @@
+import io
 import sys
 import math
 import csv
-import pandas as pd
-from PySide6.QtWidgets import (QApplication, QMainWindow, QGraphicsScene, 
-                               QGraphicsView, QVBoxLayout, QHBoxLayout, 
-                               QWidget, QLabel, QSpinBox, QSlider, QGroupBox, QPushButton, QDoubleSpinBox, QToolTip)
-from PySide6.QtCore import Qt, QRectF, QRect
-from PySide6.QtGui import QPen, QBrush, QColor, QPainter
+import mmap
+import numpy as np
+from collections import Counter, defaultdict
+from scipy.spatial import cKDTree
+from PySide6.QtWidgets import (QApplication, QMainWindow, QGraphicsScene,
+                               QGraphicsView, QVBoxLayout, QHBoxLayout,
+                               QWidget, QLabel, QSpinBox, QSlider, QGroupBox, QPushButton, QDoubleSpinBox, QToolTip,
+                               QGraphicsEllipseItem, QGraphicsItemGroup, QGraphicsRectItem,
+                               QGraphicsSimpleTextItem)
+from PySide6.QtCore import Qt, QRectF, QRect, QTimer
+from PySide6.QtGui import QPen, QBrush, QColor, QFont, QPainter, QPainterPath
 from artnet_optimizer import optimize_led_network
 # Power optimizer removed - no longer needed
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional - fall back to the Python loop
+    njit = None
+
+
+def _arrow_from_all(edge_src, edge_dst, edge_is_intercom, is_intercom_node,
+                    is_artnet_node, dir_src, dir_dst, has_directions):
+    """Arrow-origin node id per edge (-1 for no arrow), branch-for-branch
+    the same classification as the drawing code."""
+    n = edge_src.shape[0]
+    out = np.full(n, -1, dtype=np.int32)
+    for i in range(n):
+        src = edge_src[i]
+        dst = edge_dst[i]
+        if edge_is_intercom[i] == 1:
+            if is_intercom_node[src] == 1:
+                out[i] = dst
+            elif is_intercom_node[dst] == 1:
+                out[i] = src
+        elif is_artnet_node[src] == 1 and is_artnet_node[dst] == 1:
+            if has_directions:
+                d_src = dir_src[i]
+                d_dst = dir_dst[i]
+                if (d_src == src and d_dst == dst) or (d_src == dst and d_dst == src):
+                    out[i] = d_src
+                # If redirected, no arrow on this physical edge
+            else:
+                out[i] = src
+        elif is_artnet_node[src] == 1:
+            out[i] = src
+        elif is_artnet_node[dst] == 1:
+            out[i] = dst
+    return out
+
+
+def _edge_lengths(starts, ends):
+    """Euclidean length per edge from (E,3) start/end coordinate arrays."""
+    n = starts.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        dx = ends[i, 0] - starts[i, 0]
+        dy = ends[i, 1] - starts[i, 1]
+        dz = ends[i, 2] - starts[i, 2]
+        out[i] = math.sqrt(dx * dx + dy * dy + dz * dz)
+    return out
+
+
+if njit is not None:
+    _arrow_from_all = njit(
+        "int32[:](int32[:], int32[:], uint8[:], uint8[:], uint8[:], int32[:], int32[:], boolean)",
+        cache=True)(_arrow_from_all)
+    _edge_lengths = njit("float64[:](float64[:, :], float64[:, :])",
+                         cache=True)(_edge_lengths)
+
 
 class NetworkVisualizer(QMainWindow):
     def __init__(self):
@@ -20,12 +81,22 @@ class NetworkVisualizer(QMainWindow):
         # Initialize data
         self.nodes = set()
         self.edges = []
+        # Canonical SoA storage: node coords as one (N,3) array and the
+        # edges as int index pairs into it; the tuple/set views above
+        # stay for code that keys on coordinates
+        self.node_xyz = np.empty((0, 3), dtype=np.float64)
+        self.edges_idx = np.empty((0, 2), dtype=np.int64)
         self.node_diameter = 0.2
         self.line_width = 0.1
         self.arrow_width = 0.2
         self.arrow_length_percent = 50  # Percentage of edge length
         self.font_size = 3  # Font size for connection counts
         self.artnet_optimization = None
+        self._artnet_nodes_set = frozenset()  # Fast membership; set by optimize_artnet
+        self._artnet_ids = frozenset()  # same nodes as int IDs (cheaper hash)
+        self._csv_rows = None  # Cached secondary CSV parse (export/grid)
+        self._bounds = None  # Cached (min_x, max_x, min_y, max_y) over nodes
+        self._flow_by_edge = None  # Cached edge -> (flow start ID, flow end ID)
         self.show_artnet_nodes = False
         self.show_data_cables = False  # Toggle for data cables
         self.show_grid = False  # Toggle for grid display
@@ -34,15 +105,47 @@ class NetworkVisualizer(QMainWindow):
         self.selected_length_group = -1  # -1 = show all, 0+ = show specific length group
         self.length_groups = []  # Will store [(min, max, count), ...]
         self.node_ids = {}  # Dictionary to store node IDs
-        self.next_node_id = 1  # Counter for node IDs
         
         # Intercom data (loaded from CSV Type column)
         self.intercom_nodes = set()  # Set of nodes that are part of intercom edges
         self.intercom_edges = []  # List of edges marked as Type=Intercom
+        self.intercom_edges_set = set()  # Same edges, for O(1) membership
+        self._intercom_ids = frozenset()  # node IDs of the same nodes (int hash, not tuple)
+        self._intercom_edge_ids = set()  # CSV edge IDs with Type=Intercom
         
         # Edge IDs from CSV
         self.edge_ids = {}  # Maps edge tuple to its ID from CSV
         
+        # Coalesce rapid mouse moves: only the last position inside a
+        # 30 ms window triggers the tooltip computation
+        self._hover_timer = QTimer(self)
+        self._hover_timer.setSingleShot(True)
+        self._hover_timer.setInterval(30)
+        self._hover_timer.timeout.connect(self._process_hover)
+        self._pending_hover_pos = None
+        self._pending_hover_global = None
+        self._last_hover_node = None
+        self._last_tooltip_text = None
+        self._last_hover_version = None
+
+        # Pens, brushes and fonts used by every redraw; rebuilt only
+        # when a width/size control changes instead of per frame
+        self._build_styles()
+
+        # Retained scene items, so size/width nudges restyle in place
+        # instead of rebuilding the whole scene
+        self._node_items = {}  # node -> QGraphicsEllipseItem
+        self._edge_items = {}  # highlighted edge -> QGraphicsLineItem
+        self._edges_path_item = None  # one path item for all normal edges
+        self._arrows_path_item = None  # one path item for all arrows
+        self._intercom_marker_items = {}  # node -> QGraphicsEllipseItem
+        self._artnet_rect_items = {}  # node -> QGraphicsRectItem
+
+        # Render memoization: mutations bump _state_version, draw_network
+        # records what it last rendered and short-circuits no-op redraws
+        self._state_version = 0
+        self._last_rendered_version = None
+        
         # Load data
         self.load_data()
         
@@ -65,67 +168,113 @@ class NetworkVisualizer(QMainWindow):
     
     def load_data(self):
         """Load and parse the CSV file"""
+        self._state_version += 1
         try:
-            # Read the CSV file
-            df = pd.read_csv('../data/Oct10_003_stephan.csv')
-            
+            # Read the CSV file; for a few hundred rows the stdlib reader
+            # beats a DataFrame round-trip (no dtype inference, no heavy
+            # import) and we only ever consume the columns row-by-row
+            self._csv_rows = None  # Re-parse the export/grid CSV lazily
+            self._bounds = None  # Bounds follow the new node set
+            self._flow_by_edge = None  # Flow table follows the new edges
+            coord_rows = []
+            edge_id_list = []
+            types = []
+            # Map the file once and parse from memory - one bulk read
+            # instead of many small buffered reads through the file object
+            with open('../data/Oct10_003_stephan.csv', 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                reader = csv.DictReader(
+                    io.TextIOWrapper(io.BytesIO(mm), encoding='utf-8', newline=''))
+                for row in reader:
+                    try:
+                        edge_id = int(row['ID'])
+                        coord_row = (float(row['start_X']), float(row['start_Y']), float(row['start_Z']),
+                                     float(row['end_X']), float(row['end_Y']), float(row['end_Z']))
+                    except (KeyError, ValueError, TypeError) as e:
+                        print(f"Skipping row due to conversion error: {e}")
+                        continue
+                    coord_rows.append(coord_row)
+                    edge_id_list.append(edge_id)
+                    types.append(str(row.get('Type') or 'Normal').strip().lower())
+            finally:
+                mm.close()
+
             # Clear existing data
             self.nodes.clear()
             self.edges.clear()
             self.intercom_nodes.clear()
             self.intercom_edges.clear()
+            self.intercom_edges_set.clear()
+            self._intercom_edge_ids.clear()
             self.edge_ids.clear()
-            
-            # Extract start and end coordinates using column names
-            for _, row in df.iterrows():
-                try:
-                    # Read edge ID from CSV
-                    edge_id = int(row['ID'])
-                    
-                    # Start point coordinates
-                    start_x = float(row['start_X'])
-                    start_y = float(row['start_Y'])
-                    start_z = float(row['start_Z'])
-                    
-                    # End point coordinates
-                    end_x = float(row['end_X'])
-                    end_y = float(row['end_Y'])
-                    end_z = float(row['end_Z'])
-                    
-                    # Check edge type
-                    edge_type = str(row.get('Type', 'Normal')).strip()
-                    
-                    # Create unique node identifiers
-                    start_node = (start_x, start_y, start_z)
-                    end_node = (end_x, end_y, end_z)
-                    
-                    # Add nodes to set (automatically handles duplicates)
-                    self.nodes.add(start_node)
-                    self.nodes.add(end_node)
-                    
-                    # Track intercom edges and nodes
-                    edge = (start_node, end_node)
-                    if edge_type.lower() == 'intercom':
-                        self.intercom_edges.append(edge)
-                    
-                    # Store edge ID from CSV
-                    self.edge_ids[edge] = edge_id
-                    
-                    # Assign IDs to nodes if not already assigned
-                    if start_node not in self.node_ids:
-                        self.node_ids[start_node] = self.next_node_id
-                        self.next_node_id += 1
-                    if end_node not in self.node_ids:
-                        self.node_ids[end_node] = self.next_node_id
-                        self.next_node_id += 1
-                    
-                    # Add edge
-                    self.edges.append(edge)
-                    
-                except (ValueError, TypeError) as e:
-                    print(f"Skipping row due to conversion error: {e}")
-                    continue
-                
+
+            coords = np.array(coord_rows, dtype=np.float64).reshape(-1, 6)
+
+            # Quantize to integer millimetres: float equality on parsed
+            # text is fragile (nodes only merge if their decimal strings
+            # round-trip identically), while keys derived from the same
+            # mm grid always compare and hash equal
+            coords_mm = np.round(coords * 1000.0).astype(np.int64)
+            coords = coords_mm / 1000.0
+            self._edge_array = coords  # (start_xyz, end_xyz) per row, for vectorized length math
+
+            # Assign node IDs from the deduplicated endpoints; argsort over
+            # the first-occurrence indices keeps the same first-seen
+            # numbering the old per-row counter produced
+            endpoints_mm = coords_mm.reshape(-1, 3)
+            unique_mm, first_idx, inverse = np.unique(
+                endpoints_mm, axis=0, return_index=True, return_inverse=True)
+            order = np.argsort(first_idx, kind='stable')
+            self.node_xyz = unique_mm[order] / 1000.0
+            ordered_nodes = [tuple(p) for p in self.node_xyz.tolist()]
+            self.nodes.update(ordered_nodes)
+            self.node_ids = {node: i + 1 for i, node in enumerate(ordered_nodes)}
+
+            # Edge endpoints as indices into node_xyz: remap np.unique's
+            # sorted inverse through the first-seen ordering above
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[order] = np.arange(len(order))
+            self.edges_idx = rank[inverse].reshape(-1, 2)
+
+            # Spatial index over node XY for hover lookups; rebuilt here so
+            # a reload invalidates it along with everything else
+            self._node_list = ordered_nodes
+            self._kdtree = cKDTree(self.node_xyz[:, :2])
+
+            # Single pass over the plain-float tuple view
+            for i, row_vals in enumerate(coords.tolist()):
+                start_node = tuple(row_vals[0:3])
+                end_node = tuple(row_vals[3:6])
+                edge = (start_node, end_node)
+
+                # Track intercom edges and nodes; the types list was
+                # normalized (strip + lower) once at ingest, so no
+                # per-row string work happens after this loop
+                if types[i] == 'intercom':
+                    self.intercom_edges.append(edge)
+                    self.intercom_edges_set.add(edge)
+                    self._intercom_edge_ids.add(edge_id_list[i])
+
+                # Store edge ID from CSV
+                self.edge_ids[edge] = edge_id_list[i]
+
+                # Add edge
+                self.edges.append(edge)
+
+            # Node -> incident edges, in edge order; hover and the node
+            # report read this short list instead of scanning every edge
+            self._node_edges = defaultdict(list)
+            for edge in self.edges:
+                self._node_edges[edge[0]].append(edge)
+                if edge[1] != edge[0]:
+                    self._node_edges[edge[1]].append(edge)
+
+            # Arrow origins for the no-optimization case (intercom edges
+            # still get arrows); optimize_artnet refreshes this cache
+            self._compute_arrow_origins()
+
+
             # Identify pure intercom nodes (nodes that ONLY appear in intercom edges)
             # These are the actual intercom endpoint devices
             all_intercom_nodes = set()
@@ -133,7 +282,7 @@ class NetworkVisualizer(QMainWindow):
                 all_intercom_nodes.add(edge[0])
                 all_intercom_nodes.add(edge[1])
             
-            normal_edges = [e for e in self.edges if e not in self.intercom_edges]
+            normal_edges = [e for e in self.edges if e not in self.intercom_edges_set]
             mixed_nodes = set()  # Nodes that appear in both intercom AND normal edges
             for edge in normal_edges:
                 if edge[0] in all_intercom_nodes:
@@ -143,6 +292,15 @@ class NetworkVisualizer(QMainWindow):
             
             # Pure intercom nodes = nodes ONLY in intercom edges
             self.intercom_nodes = all_intercom_nodes - mixed_nodes
+            # Int-ID mirror: membership tests hash one int instead of a
+            # tuple of three floats
+            self._intercom_ids = frozenset(self.node_ids[n] for n in self.intercom_nodes)
+
+            # Per-node type codes (0=regular, 1=ArtNet, 2=intercom) so the
+            # hover handler resolves the label with one dict lookup
+            self._node_type = {n: (2 if n in self.intercom_nodes else
+                                   (1 if n in self._artnet_nodes_set else 0))
+                               for n in self.nodes}
             
             print(f"Successfully loaded {len(self.nodes)} nodes and {len(self.edges)} edges")
             print(f"Identified {len(self.intercom_nodes)} pure intercom nodes and {len(self.intercom_edges)} intercom edges")
@@ -152,10 +310,121 @@ class NetworkVisualizer(QMainWindow):
         except Exception as e:
             print(f"Error loading data: {e}")
             # Create some sample data for testing
+            self._bounds = None
             self.nodes = {(0.0, 0.0, 0.0), (10.0, 0.0, 0.0), (5.0, 5.0, 0.0), (10.0, 10.0, 0.0)}
-            self.edges = [((0.0, 0.0, 0.0), (10.0, 0.0, 0.0)), ((10.0, 0.0, 0.0), (5.0, 5.0, 0.0)), 
+            self.edges = [((0.0, 0.0, 0.0), (10.0, 0.0, 0.0)), ((10.0, 0.0, 0.0), (5.0, 5.0, 0.0)),
                          ((5.0, 5.0, 0.0), (10.0, 10.0, 0.0)), ((0.0, 0.0, 0.0), (5.0, 5.0, 0.0))]
+            self._edge_array = np.array([s + e for s, e in self.edges], dtype=np.float64)
+            self._node_list = list(self.nodes)
+            self.node_xyz = np.array(self._node_list, dtype=np.float64)
+            # IDs for the fixture nodes, same first-seen rule as the CSV path
+            self.node_ids = {}
+            next_id = 1
+            for s, e in self.edges:
+                for n in (s, e):
+                    if n not in self.node_ids:
+                        self.node_ids[n] = next_id
+                        next_id += 1
+            node_index = {n: i for i, n in enumerate(self._node_list)}
+            self.edges_idx = np.array([(node_index[s], node_index[e])
+                                       for s, e in self.edges], dtype=np.int64)
+            self._kdtree = cKDTree(self.node_xyz[:, :2])
+            self._node_edges = defaultdict(list)
+            for edge in self.edges:
+                self._node_edges[edge[0]].append(edge)
+                if edge[1] != edge[0]:
+                    self._node_edges[edge[1]].append(edge)
+            self._compute_arrow_origins()
     
+    def _compute_arrow_origins(self):
+        """Cache which node each edge's arrow originates from"""
+        # Mirrors the arrow-drawing branch logic; the result only changes
+        # when the data or the optimization changes, so it is recomputed
+        # after load_data and at the end of optimize_artnet instead of
+        # being re-derived edge-by-edge in every hover and report loop
+        opt = self.artnet_optimization
+        # optimize_artnet publishes _artnet_nodes_set before calling us,
+        # so reuse it rather than building another set from the list
+        artnet_nodes_set = self._artnet_nodes_set if opt else frozenset()
+        edge_directions = opt['edge_directions'] if opt and 'edge_directions' in opt else None
+
+        # Tooltip contents derive from these results; drop the cache
+        self._last_hover_node = None
+        self._last_tooltip_text = None
+
+        if not self.edges:
+            self._arrow_from = {}
+            self._edge_mask_intercom = np.zeros(0, dtype=np.bool_)
+            self._edge_mask_artnet_both = np.zeros(0, dtype=np.bool_)
+            self._edge_mask_artnet_start = np.zeros(0, dtype=np.bool_)
+            return
+
+        # Integer-encode the classification inputs once, aligned to
+        # self.edges order
+        node_index = {node: i for i, node in enumerate(self._node_list)}
+        n_nodes = len(self._node_list)
+        n_edges = len(self.edges)
+
+        is_intercom_node = np.zeros(n_nodes, dtype=np.uint8)
+        for node in self.intercom_nodes:
+            is_intercom_node[node_index[node]] = 1
+        is_artnet_node = np.zeros(n_nodes, dtype=np.uint8)
+        for node in artnet_nodes_set:
+            is_artnet_node[node_index[node]] = 1
+
+        edge_src = np.fromiter((node_index[e[0]] for e in self.edges),
+                               dtype=np.int32, count=n_edges)
+        edge_dst = np.fromiter((node_index[e[1]] for e in self.edges),
+                               dtype=np.int32, count=n_edges)
+        edge_is_intercom = np.fromiter(
+            (1 if e in self.intercom_edges_set else 0 for e in self.edges),
+            dtype=np.uint8, count=n_edges)
+
+        dir_src = np.full(n_edges, -1, dtype=np.int32)
+        dir_dst = np.full(n_edges, -1, dtype=np.int32)
+        if edge_directions is not None:
+            for i, edge in enumerate(self.edges):
+                data_start, data_end = edge_directions.get(edge, (None, None))
+                if data_start is not None:
+                    dir_src[i] = node_index[data_start]
+                    dir_dst[i] = node_index[data_end]
+
+        # Per-edge membership masks, kept for reuse by other callers
+        src_artnet = is_artnet_node[edge_src].astype(np.bool_)
+        dst_artnet = is_artnet_node[edge_dst].astype(np.bool_)
+        self._edge_mask_intercom = edge_is_intercom.astype(np.bool_)
+        self._edge_mask_artnet_both = src_artnet & dst_artnet
+        self._edge_mask_artnet_start = src_artnet
+
+        if njit is not None:
+            # Run the whole edge list through the compiled kernel
+            arrow_ids = _arrow_from_all(edge_src, edge_dst, edge_is_intercom,
+                                        is_intercom_node, is_artnet_node,
+                                        dir_src, dir_dst, edge_directions is not None)
+        else:
+            # Same classification as straight-line mask arithmetic: one
+            # np.where cascade over all edges, no per-edge dict lookups
+            intercom = self._edge_mask_intercom
+            src_ic = is_intercom_node[edge_src].astype(np.bool_)
+            dst_ic = is_intercom_node[edge_dst].astype(np.bool_)
+            if edge_directions is not None:
+                dir_matches = (((dir_src == edge_src) & (dir_dst == edge_dst)) |
+                               ((dir_src == edge_dst) & (dir_dst == edge_src)))
+                both_origin = np.where(dir_matches, dir_src, -1)
+            else:
+                both_origin = edge_src
+            arrow_ids = np.where(
+                intercom,
+                np.where(src_ic, edge_dst, np.where(dst_ic, edge_src, -1)),
+                np.where(self._edge_mask_artnet_both, both_origin,
+                         np.where(self._edge_mask_artnet_start, edge_src,
+                                  np.where(dst_artnet, edge_dst, -1))))
+
+        self._arrow_from = {
+            edge: (self._node_list[a] if a >= 0 else None)
+            for edge, a in zip(self.edges, arrow_ids.tolist())
+        }
+
     def setup_ui(self):
         """Setup the user interface"""
         central_widget = QWidget()
@@ -166,8 +435,19 @@ class NetworkVisualizer(QMainWindow):
         
         # Graphics view for network
         self.scene = QGraphicsScene()
+        self.scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
         self.view = QGraphicsView(self.scene)
-        self.view.setRenderHint(QPainter.Antialiasing)
+        # Antialiasing reads nicely at this scale but costs too much on
+        # very large networks, so it is only enabled for smaller ones
+        if len(self.edges) <= 5000:
+            self.view.setRenderHint(QPainter.Antialiasing)
+        # Scene-heavy view tuning: skip painter state save/restore per
+        # item, don't grow exposed regions for antialiasing, cache the
+        # (static) background and only repaint dirtied viewport regions
+        self.view.setOptimizationFlags(QGraphicsView.DontSavePainterState |
+                                       QGraphicsView.DontAdjustForAntialiasing)
+        self.view.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.view.setCacheMode(QGraphicsView.CacheBackground)
         self.view.setMouseTracking(True)  # Enable mouse tracking for tooltips
         self.view.mouseMoveEvent = self.view_mouse_move_event  # Override mouse move event
         layout.addWidget(self.view, stretch=5)
@@ -321,50 +601,131 @@ class NetworkVisualizer(QMainWindow):
         
         control_layout.addStretch()
     
+    def _build_styles(self):
+        """(Re)build the pens, brushes and fonts the render path uses"""
+        # Value-like Qt objects, but each construction is a Python->C++
+        # round trip; cache them and refresh only when a control changes
+        self._node_brush = QBrush(QColor(255, 0, 0))  # Red nodes
+        self._node_pen = QPen(QColor(0, 0, 0), 1)
+        self._artnet_brush = QBrush(QColor(0, 255, 0))  # Green for ArtNet nodes
+        self._artnet_pen = QPen(QColor(0, 0, 0), 2)
+        self._rect_pen = QPen(QColor(0, 0, 255), 2)  # Blue rectangle
+        self._intercom_pen = QPen(QColor(255, 140, 0), 3)  # Orange border, thick
+        self._count_brush = QBrush(QColor(0, 100, 255))  # Blue text
+        self._count_font = QFont()
+        self._count_font.setPointSize(self.font_size)
+        self._normal_pen = QPen(QColor(100, 100, 100), self.line_width)
+        self._highlighted_pen = QPen(QColor(255, 0, 0), self.line_width * 8)  # Bright red, 8x thicker
+        self._arrow_pen = QPen(QColor(255, 0, 255), self.arrow_width)  # Magenta arrows
+
     def on_node_diameter_changed(self, value):
         """Handle node diameter change"""
         self.node_diameter = value
-        self.draw_network()
+        self._state_version += 1
+        self._apply_styles()
     
     def on_line_width_changed(self, value):
         """Handle line width change"""
         self.line_width = value
-        self.draw_network()
-    
+        self._state_version += 1
+        self._build_styles()
+        self._apply_styles()
+
     def on_arrow_width_changed(self, value):
         """Handle arrow width change"""
         self.arrow_width = value
-        self.draw_network()
+        self._state_version += 1
+        self._build_styles()
+        # Only the pen changes, so restyle the retained arrow path in
+        # place; no arrows on screen means nothing to update
+        if self._arrows_path_item is not None:
+            self._arrows_path_item.setPen(self._arrow_pen)
+        else:
+            self.draw_network()
     
     def on_arrow_length_changed(self, value):
         """Handle arrow length percentage change"""
         self.arrow_length_percent = value
+        self._state_version += 1
         self.draw_network()
     
     def on_font_size_changed(self, value):
         """Handle font size change"""
         self.font_size = value
+        self._state_version += 1
+        self._build_styles()
         self.draw_network()
     
+    def _apply_styles(self):
+        """Restyle the retained node/edge items in place"""
+        # Parameter nudges (node diameter, line width) only change pens
+        # and rects, so the existing items are updated rather than
+        # rebuilding the scene; topology changes still go through
+        # draw_network
+        if not self._node_items and not self._edge_items:
+            self.draw_network()
+            return
+
+        selected_length = None
+        if 0 <= self.selected_length_group < len(self.length_groups):
+            selected_length, _ = self.length_groups[self.selected_length_group]
+
+        # Highlight membership is fixed between rebuilds (the length
+        # filter goes through draw_network), so only the pens change here
+        if self._edges_path_item is not None:
+            self._edges_path_item.setPen(self._normal_pen)
+        for item in self._edge_items.values():
+            item.setPen(self._highlighted_pen)
+
+        radius = self.node_diameter / 2
+        for node, item in self._node_items.items():
+            item.setRect(node[0] - radius, node[1] - radius,
+                         self.node_diameter, self.node_diameter)
+
+        intercom_size = self.node_diameter * 1.5
+        for node, item in self._intercom_marker_items.items():
+            item.setRect(node[0] - intercom_size/2, node[1] - intercom_size/2,
+                         intercom_size, intercom_size)
+
+        for node, item in self._artnet_rect_items.items():
+            item.setRect(node[0] - radius, node[1] - radius,
+                         self.node_diameter, self.node_diameter)
+
     def view_mouse_move_event(self, event):
         """Handle mouse move events to show tooltips"""
+        # Just record the position; the single-shot timer processes the
+        # most recent one so a burst of moves costs one tooltip update
+        self._pending_hover_pos = event.pos()
+        self._pending_hover_global = event.globalPos()
+        self._hover_timer.start()
+
+    def _process_hover(self):
+        """Show the tooltip for the last recorded mouse position"""
+        if self._pending_hover_pos is None:
+            return
+
         # Get the scene position
-        scene_pos = self.view.mapToScene(event.pos())
+        scene_pos = self.view.mapToScene(self._pending_hover_pos)
         
-        # Find the closest node within a reasonable distance
+        # Find the closest node within a very large hover area (20x the node
+        # radius for easy triggering) via the KD-tree instead of scanning
+        # every node on each mouse move
         closest_node = None
-        min_distance = float('inf')
         node_radius = self.node_diameter / 2
-        
-        for node in self.nodes:
-            node_x, node_y = node[0], node[1]
-            distance = math.sqrt((scene_pos.x() - node_x)**2 + (scene_pos.y() - node_y)**2)
-            
-            # Check if mouse is within a very large hover area (20x the node radius for easy triggering)
-            if distance <= node_radius * 20:  # Very large hover area - easy to trigger
-                if distance < min_distance:
-                    min_distance = distance
-                    closest_node = node
+        distance, idx = self._kdtree.query([scene_pos.x(), scene_pos.y()],
+                                           distance_upper_bound=node_radius * 20)
+        if math.isfinite(distance):
+            closest_node = self._node_list[idx]
+        
+        # Mouse jiggling near the same node: reshow the cached text at the
+        # new cursor position without redoing the edge scan. The text
+        # embeds render state (node type, arrow count), so the cache is
+        # only valid for the state version it was computed under
+        if (closest_node is not None and closest_node == self._last_hover_node
+                and self._last_hover_version == self._state_version):
+            QToolTip.showText(self._pending_hover_global, self._last_tooltip_text,
+                              self.view, QRect(), 60000)
+            return
         
         if closest_node:
             # Calculate tooltip information
@@ -374,51 +735,22 @@ class NetworkVisualizer(QMainWindow):
             total_count = 0
             edge_ids = []
             
-            # Count total edges and build edge ID list
-            for edge in self.edges:
-                start_node, end_node = edge
-                if start_node == closest_node or end_node == closest_node:
-                    total_count += 1
-                    edge_ids.append(str(self.edge_ids.get(edge, "?")))  # Edge ID from CSV
+            # Count total edges and build edge ID list from the adjacency
+            for edge in self._node_edges[closest_node]:
+                total_count += 1
+                edge_ids.append(str(self.edge_ids.get(edge, "?")))  # Edge ID from CSV
             
-            # Count arrows - USE EXACT SAME LOGIC AS ARROW DRAWING
+            # Count arrows from the cached origins - same logic as drawing
             if (self.artnet_optimization and self.show_artnet_nodes):
-                artnet_nodes_set = set(self.artnet_optimization['artnet_nodes'])
-                
-                for edge in self.edges:
-                    start_node, end_node = edge
-                    arrow_from = None
-                    
-                    # EXACT SAME LOGIC AS ARROW DRAWING
-                    if edge in self.intercom_edges:
-                        if start_node in self.intercom_nodes:
-                            arrow_from = end_node
-                        elif end_node in self.intercom_nodes:
-                            arrow_from = start_node
-                    elif start_node in artnet_nodes_set and end_node in artnet_nodes_set:
-                        if 'edge_directions' in self.artnet_optimization:
-                            data_start, data_end = self.artnet_optimization['edge_directions'].get(edge, (None, None))
-                            if (data_start == start_node and data_end == end_node) or \
-                               (data_start == end_node and data_end == start_node):
-                                arrow_from = data_start
-                            # If redirected, don't count (arrow_from stays None)
-                        else:
-                            arrow_from = start_node
-                    elif start_node in artnet_nodes_set:
-                        arrow_from = start_node
-                    elif end_node in artnet_nodes_set:
-                        arrow_from = end_node
-                    
-                    if arrow_from == closest_node:
-                        arrows_drawn += 1
-            
-            # Check if this is an ArtNet node
-            is_artnet = (self.artnet_optimization and 
-                        self.show_artnet_nodes and 
-                        closest_node in self.artnet_optimization['artnet_nodes'])
+                arrows_drawn = sum(1 for edge in self._node_edges[closest_node]
+                                   if self._arrow_from.get(edge) == closest_node)
             
-            # Check if this is an intercom node
-            is_intercom = closest_node in self.intercom_nodes
+            # Resolve the node type from the memoized per-node code
+            node_kind = self._node_type.get(closest_node, 0)
+            is_artnet = (node_kind == 1 and
+                         bool(self.artnet_optimization) and
+                         self.show_artnet_nodes)
+            is_intercom = (node_kind == 2)
             
             # Determine node type
             if is_intercom:
@@ -437,31 +769,37 @@ class NetworkVisualizer(QMainWindow):
                 tooltip_text += f" (+{len(edge_ids)-5} more)"
             tooltip_text += f"\nType: {node_type}"
             
+            self._last_hover_node = closest_node
+            self._last_tooltip_text = tooltip_text
+            self._last_hover_version = self._state_version
+            
             # Show tooltip at cursor position - persistent until new node is hovered
-            QToolTip.showText(event.globalPos(), tooltip_text, self.view, QRect(), 60000)  # 60 second timeout
+            QToolTip.showText(self._pending_hover_global, tooltip_text, self.view, QRect(), 60000)  # 60 second timeout
         # Don't hide tooltip when mouse moves away - let it stay visible for reading
     
     def calculate_length_groups(self):
         """Calculate all unique edge lengths"""
-        import math
-        
-        # Calculate all edge lengths with counts
-        length_counts = {}
-        for edge in self.edges:
-            start_node, end_node = edge
-            dx = end_node[0] - start_node[0]
-            dy = end_node[1] - start_node[1]
-            dz = end_node[2] - start_node[2]
-            length = math.sqrt(dx*dx + dy*dy + dz*dz)
-            length_rounded = round(length, 2)  # Round to 2 decimal places
-            length_counts[length_rounded] = length_counts.get(length_rounded, 0) + 1
-        
-        if not length_counts:
+        # All edge lengths in one pass over the cached array - through
+        # the compiled kernel when Numba is around, otherwise the
+        # equivalent vectorized NumPy expression; np.unique on the
+        # rounded values replaces the per-edge dict counting
+        if njit is not None:
+            lengths = _edge_lengths(self._edge_array[:, 0:3],
+                                    self._edge_array[:, 3:6])
+        else:
+            deltas = self._edge_array[:, 3:6] - self._edge_array[:, 0:3]
+            lengths = np.sqrt((deltas * deltas).sum(axis=1))
+        self._edge_lengths = lengths  # reused wherever a total/sum is needed
+        rounded = np.round(lengths, 2)
+        self._edge_lengths_r2 = rounded  # 2-decimal view for the highlight test
+        unique_lengths, counts = np.unique(rounded, return_counts=True)
+
+        if not unique_lengths.size:
             self.length_groups = []
             return
-        
-        # Sort unique lengths and create list of (length, count)
-        self.length_groups = [(length, count) for length, count in sorted(length_counts.items())]
+
+        # Sorted unique lengths paired with their counts
+        self.length_groups = list(zip(unique_lengths.tolist(), counts.tolist()))
         
         # Update slider range
         if self.length_groups:
@@ -476,7 +814,8 @@ class NetworkVisualizer(QMainWindow):
     def on_length_filter_changed(self, value):
         """Handle edge length filter change"""
         self.selected_length_group = value
-        
+        self._state_version += 1
+
         if value == -1:
             self.length_filter_label.setText(f"All ({len(self.edges)})")
         elif 0 <= value < len(self.length_groups):
@@ -495,12 +834,13 @@ class NetworkVisualizer(QMainWindow):
     
     def optimize_artnet(self):
         """Run ArtNet optimization"""
+        self._state_version += 1
         try:
             print("Optimizing ArtNet distribution...")
             
             # Include ALL edges in optimization (including intercom edges)
             # This ensures nodes connecting to intercom endpoints become smart nodes
-            self.artnet_optimization = optimize_led_network(self.nodes, self.edges)
+            self.artnet_optimization = optimize_led_network(self.nodes, self.edges, verbose=True)
             
             # After optimization, ensure nodes connecting to intercom nodes are ArtNet nodes
             # and that pure intercom nodes are NOT ArtNet nodes
@@ -519,16 +859,23 @@ class NetworkVisualizer(QMainWindow):
                     artnet_set.add(end_node)
             
             self.artnet_optimization['artnet_nodes'] = list(artnet_set)
+            self._artnet_nodes_set = frozenset(artnet_set)
+            self._artnet_ids = frozenset(self.node_ids[n] for n in artnet_set)
+            self._node_type = {n: (2 if n in self.intercom_nodes else
+                                   (1 if n in self._artnet_nodes_set else 0))
+                               for n in self.nodes}
             print(f"ArtNet optimization: {len(artnet_set)} nodes (including nodes connecting to {len(self.intercom_nodes)} intercom endpoints)")
+
+            # Refresh the cached arrow origins now that the node set and
+            # edge directions are final; the export flow table derives
+            # from the same state
+            self._compute_arrow_origins()
+            self._flow_by_edge = None
             
-            # Calculate total edge length
-            total_edge_length = 0
-            for edge in self.edges:
-                start_node, end_node = edge
-                start_x, start_y, start_z = start_node
-                end_x, end_y, end_z = end_node
-                edge_length = math.sqrt((end_x - start_x)**2 + (end_y - start_y)**2 + (end_z - start_z)**2)
-                total_edge_length += edge_length
+            # Total edge length from the cached per-edge lengths
+            if not hasattr(self, '_edge_lengths'):
+                self.calculate_length_groups()
+            total_edge_length = float(self._edge_lengths.sum())
             
             # Update info display
             info_text = f"ArtNet Nodes: {len(self.artnet_optimization['artnet_nodes'])}\n"
@@ -569,12 +916,14 @@ class NetworkVisualizer(QMainWindow):
     def toggle_artnet_display(self):
         """Toggle display of ArtNet nodes"""
         self.show_artnet_nodes = self.show_artnet_checkbox.isChecked()
+        self._state_version += 1
         self.draw_network()
     
     def toggle_data_cables(self):
         """Toggle display of data cables"""
         self.show_data_cables = self.show_cables_checkbox.isChecked()
-        
+        self._state_version += 1
+
         if self.show_data_cables and not self.artnet_optimization:
             print("Data cables require ArtNet optimization. Please run 'Optimize ArtNet Distribution' first.")
             self.cable_info_label.setText("Run ArtNet Optimization First")
@@ -587,6 +936,7 @@ class NetworkVisualizer(QMainWindow):
     def toggle_grid(self):
         """Toggle display of grid"""
         self.show_grid = self.show_grid_checkbox.isChecked()
+        self._state_version += 1
         self.draw_network()
     
     def print_all_node_results(self):
@@ -595,9 +945,12 @@ class NetworkVisualizer(QMainWindow):
             print("No ArtNet optimization results available. Run optimization first.")
             return
         
-        print("\n=== ALL NODE RESULTS ===")
-        print(f"{'Node ID':<8} {'Coordinates':<20} {'Type':<12} {'Total':<6} {'Arrows':<9} {'Edge IDs':<30}")
-        print("-" * 85)
+        # Assemble the whole report in memory and emit it with one write;
+        # a print per node means a TTY flush per node on large networks
+        buf = io.StringIO()
+        buf.write("\n=== ALL NODE RESULTS ===\n")
+        buf.write(f"{'Node ID':<8} {'Coordinates':<20} {'Type':<12} {'Total':<6} {'Arrows':<9} {'Edge IDs':<30}\n")
+        buf.write("-" * 85 + "\n")
         
         for node in sorted(self.nodes, key=lambda n: self.node_ids.get(n, 0)):
             node_id = self.node_ids.get(node, 0)
@@ -609,45 +962,17 @@ class NetworkVisualizer(QMainWindow):
             arrows_drawn = 0
             edge_ids = []
             
-            # Count total edges and build edge ID list
-            for edge in self.edges:
-                start_node, end_node = edge
-                if start_node == node or end_node == node:
-                    total_connections += 1
-                    edge_ids.append(str(self.edge_ids.get(edge, "?")))  # Edge ID from CSV
+            # Count total edges and build edge ID list from the adjacency
+            for edge in self._node_edges[node]:
+                total_connections += 1
+                edge_ids.append(str(self.edge_ids.get(edge, "?")))  # Edge ID from CSV
             
-            # Count arrows - USE EXACT SAME LOGIC AS ARROW DRAWING
-            artnet_nodes_set = set(self.artnet_optimization['artnet_nodes'])
-            
-            for edge in self.edges:
-                start_node, end_node = edge
-                arrow_from = None
-                
-                # EXACT SAME LOGIC AS ARROW DRAWING
-                if edge in self.intercom_edges:
-                    if start_node in self.intercom_nodes:
-                        arrow_from = end_node
-                    elif end_node in self.intercom_nodes:
-                        arrow_from = start_node
-                elif start_node in artnet_nodes_set and end_node in artnet_nodes_set:
-                    if 'edge_directions' in self.artnet_optimization:
-                        data_start, data_end = self.artnet_optimization['edge_directions'].get(edge, (None, None))
-                        if (data_start == start_node and data_end == end_node) or \
-                           (data_start == end_node and data_end == start_node):
-                            arrow_from = data_start
-                        # If redirected, don't count (arrow_from stays None)
-                    else:
-                        arrow_from = start_node
-                elif start_node in artnet_nodes_set:
-                    arrow_from = start_node
-                elif end_node in artnet_nodes_set:
-                    arrow_from = end_node
-                
-                if arrow_from == node:
-                    arrows_drawn += 1
+            # Count arrows from the cached origins - same logic as drawing
+            arrows_drawn = sum(1 for edge in self._node_edges[node]
+                               if self._arrow_from.get(edge) == node)
             
             # Determine node type
-            is_artnet = node in self.artnet_optimization['artnet_nodes']
+            is_artnet = node in self._artnet_nodes_set
             node_type = "ArtNet Node" if is_artnet else "Regular Node"
             
             # Get ArtNet count (red number) - this is the number of arrows drawn FROM this ArtNet node
@@ -658,142 +983,160 @@ class NetworkVisualizer(QMainWindow):
             if len(edge_ids) > 10:
                 edge_ids_str += f"...(+{len(edge_ids)-10} more)"
             
-            print(f"{node_id:<8} {coords:<20} {node_type:<12} {total_connections:<6} {arrows_drawn:<9} {edge_ids_str:<30}")
+            buf.write(f"{node_id:<8} {coords:<20} {node_type:<12} {total_connections:<6} {arrows_drawn:<9} {edge_ids_str:<30}\n")
         
-        print("-" * 85)
-        print(f"Total nodes: {len(self.nodes)}")
-        print(f"ArtNet nodes: {len(self.artnet_optimization['artnet_nodes'])}")
-        print(f"Regular nodes: {len(self.nodes) - len(self.artnet_optimization['artnet_nodes'])}")
-        print("=" * 85)
+        buf.write("-" * 85 + "\n")
+        buf.write(f"Total nodes: {len(self.nodes)}\n")
+        buf.write(f"ArtNet nodes: {len(self.artnet_optimization['artnet_nodes'])}\n")
+        buf.write(f"Regular nodes: {len(self.nodes) - len(self.artnet_optimization['artnet_nodes'])}\n")
+        buf.write("=" * 85 + "\n")
+        sys.stdout.write(buf.getvalue())
     
+    def _load_csv_rows(self):
+        """Parse Oct10_003_stephan.csv once and reuse the rows"""
+        # export_edge_data and _calculate_grid_coordinates both consume
+        # this file; cache the parsed rows instead of re-reading per call
+        if self._csv_rows is None:
+            with open('Oct10_003_stephan.csv', newline='') as f:
+                self._csv_rows = list(csv.DictReader(f))
+        return self._csv_rows
+
+    def _recompute_flow_table(self):
+        """Rebuild the edge -> (flow start ID, flow end ID) cache"""
+        # Same branch logic the export loop used to run per row per
+        # call; recomputed lazily after load_data or optimize_artnet
+        # invalidate it
+        flow = {}
+        edge_directions = (self.artnet_optimization or {}).get('edge_directions')
+        for edge in self.edges:
+            start_node, end_node = edge
+
+            # Determine data flow direction
+            # Special case: Intercom nodes can only be data flow ENDS,
+            # never STARTS. Intercom classification comes from the edge
+            # IDs collected at ingest - no per-edge string normalization
+            if self.edge_ids.get(edge) in self._intercom_edge_ids:
+                # For intercom edges, data flows TO the intercom node
+                # Find which node is the intercom node; compare the
+                # int node IDs so membership hashes ints rather than
+                # float tuples
+                start_id = self.node_ids.get(start_node, "Unknown")
+                end_id = self.node_ids.get(end_node, "Unknown")
+                start_ic = start_id in self._intercom_ids
+                end_ic = end_id in self._intercom_ids
+                if start_ic and not end_ic:
+                    # Start is intercom, data flows FROM end TO start
+                    flow[edge] = (end_id, start_id)
+                elif end_ic and not start_ic:
+                    # End is intercom, data flows FROM start TO end
+                    flow[edge] = (start_id, end_id)
+                # Both or neither are intercom - no flow for intercom-to-intercom
+            elif edge_directions is not None:
+                # Use balanced directions that respect 4-port limit
+                data_start, data_end = edge_directions.get(edge, (None, None))
+                if data_start is not None:
+                    flow[edge] = (self.node_ids.get(data_start, "Unknown"),
+                                  self.node_ids.get(data_end, "Unknown"))
+            else:
+                # Fallback to old logic if edge_directions not available
+                if start_node in self._artnet_nodes_set:
+                    flow[edge] = (self.node_ids.get(start_node, "Unknown"),
+                                  self.node_ids.get(end_node, "Unknown"))
+                elif end_node in self._artnet_nodes_set:
+                    flow[edge] = (self.node_ids.get(end_node, "Unknown"),
+                                  self.node_ids.get(start_node, "Unknown"))
+        self._flow_by_edge = flow
+
     def export_edge_data(self):
         """Export edge data to CSV file"""
         if not self.artnet_optimization:
             print("No ArtNet optimization results available. Run optimization first.")
             return
         
-        # Read original CSV to get Type column
-        edge_types = {}
+        # Read original CSV to get Type column, keyed by edge ID - one
+        # int hash per row instead of hashing two coordinate tuples.
+        # Column absence is decided once up front so the comprehension
+        # only normalizes values, not schema
+        edge_type_by_id = {}
         try:
-            df = pd.read_csv('Oct10_003_stephan.csv')
-            for i, row in df.iterrows():
-                start_node = (float(row['start_X']), float(row['start_Y']), float(row['start_Z']))
-                end_node = (float(row['end_X']), float(row['end_Y']), float(row['end_Z']))
-                edge = (start_node, end_node)
-                edge_types[edge] = str(row.get('Type', 'Normal')).strip()
+            csv_rows = self._load_csv_rows()
+            if csv_rows and 'Type' in csv_rows[0]:
+                edge_type_by_id = {int(row['ID']): (row['Type'] or 'Normal').strip()
+                                   for row in csv_rows}
+            else:
+                edge_type_by_id = {int(row['ID']): 'Normal' for row in csv_rows}
         except Exception as e:
             print(f"Warning: Could not read Type column from CSV: {e}")
         
         filename = "edge_data_export.csv"
         
+        # All edge lengths in one vectorized pass; the per-row direction
+        # logic below stays in Python
+        if not hasattr(self, '_edge_lengths'):
+            self.calculate_length_groups()
+        lengths = self._edge_lengths
+        
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+            # Flow directions are recomputed only when the data or the
+            # optimization changes; the export loop just looks them up
+            if self._flow_by_edge is None:
+                self._recompute_flow_table()
+
+            # Assemble all rows first and hand them to writerows in one
+            # call - one _csv dispatch instead of one per edge; lengths
+            # are preformatted in a single pass
+            length_strs = [f"{edge_length:.2f}" for edge_length in lengths.tolist()]
+            no_flow = ("No Flow", "No Flow")
+            rows = []
+            for edge, length_str in zip(self.edges, length_strs):
+                start_node, end_node = edge
+                edge_id = self.edge_ids.get(edge, "?")  # Edge ID from CSV
+
+                start_x, start_y, start_z = start_node
+                end_x, end_y, end_z = end_node
+
+                # Get edge type from original CSV first
+                edge_type = edge_type_by_id.get(edge_id, "Normal")
+                flow_start_id, flow_end_id = self._flow_by_edge.get(edge, no_flow)
+
+                rows.append([edge_id, length_str,
+                             start_x, start_y, start_z,
+                             end_x, end_y, end_z,
+                             flow_start_id, flow_end_id, edge_type])
+
+            with open(filename, 'w', newline='', encoding='utf-8',
+                      buffering=1 << 20) as csvfile:
                 writer = csv.writer(csvfile)
-                
-                # Write header
                 writer.writerow(['Edge ID', 'Edge Length', 'Start X', 'Start Y', 'Start Z', 'End X', 'End Y', 'End Z', 'Data Flow Start Node ID', 'Data Flow End Node ID', 'Type'])
-                
-                # Process each edge
-                for edge in self.edges:
-                    start_node, end_node = edge
-                    edge_id = self.edge_ids.get(edge, "?")  # Edge ID from CSV
-                    
-                    # Calculate edge length (Euclidean distance)
-                    start_x, start_y, start_z = start_node
-                    end_x, end_y, end_z = end_node
-                    edge_length = math.sqrt((end_x - start_x)**2 + (end_y - start_y)**2 + (end_z - start_z)**2)
-                    
-                    # Get edge type from original CSV first
-                    edge_type = edge_types.get(edge, "Normal")
-                    
-                    # Determine data flow direction
-                    # Special case: Intercom nodes can only be data flow ENDS, never STARTS
-                    if edge_type.lower() == 'intercom':
-                        # For intercom edges, data flows TO the intercom node
-                        # Find which node is the intercom node
-                        if start_node in self.intercom_nodes and end_node not in self.intercom_nodes:
-                            # Start is intercom, data flows FROM end TO start
-                            flow_start_id = self.node_ids.get(end_node, "Unknown")
-                            flow_end_id = self.node_ids.get(start_node, "Unknown")
-                        elif end_node in self.intercom_nodes and start_node not in self.intercom_nodes:
-                            # End is intercom, data flows FROM start TO end
-                            flow_start_id = self.node_ids.get(start_node, "Unknown")
-                            flow_end_id = self.node_ids.get(end_node, "Unknown")
-                        else:
-                            # Both or neither are intercom - no flow for intercom-to-intercom
-                            flow_start_id = "No Flow"
-                            flow_end_id = "No Flow"
-                    elif 'edge_directions' in self.artnet_optimization:
-                        # Use balanced directions that respect 4-port limit
-                        data_start, data_end = self.artnet_optimization['edge_directions'].get(edge, (None, None))
-                        if data_start is not None:
-                            flow_start_id = self.node_ids.get(data_start, "Unknown")
-                            flow_end_id = self.node_ids.get(data_end, "Unknown")
-                        else:
-                            flow_start_id = "No Flow"
-                            flow_end_id = "No Flow"
-                    else:
-                        # Fallback to old logic if edge_directions not available
-                        if start_node in self.artnet_optimization['artnet_nodes']:
-                            flow_start_id = self.node_ids.get(start_node, "Unknown")
-                            flow_end_id = self.node_ids.get(end_node, "Unknown")
-                        elif end_node in self.artnet_optimization['artnet_nodes']:
-                            flow_start_id = self.node_ids.get(end_node, "Unknown")
-                            flow_end_id = self.node_ids.get(start_node, "Unknown")
-                        else:
-                            flow_start_id = "No Flow"
-                            flow_end_id = "No Flow"
-                    
-                    # Write edge data
-                    writer.writerow([edge_id, f"{edge_length:.2f}", 
-                                   start_x, start_y, start_z, 
-                                   end_x, end_y, end_z, 
-                                   flow_start_id, flow_end_id, edge_type])
-            
+                writer.writerows(rows)
+
             print(f"Edge data exported to: {filename}")
             print(f"Exported {len(self.edges)} edges")
             
-            # Now create the edge length frequency CSV
-            self._export_edge_length_frequency()
+            # Now create the edge length frequency CSV from the same pass
+            self._export_edge_length_frequency(lengths)
             
         except Exception as e:
             print(f"Error exporting edge data: {e}")
     
-    def _export_edge_length_frequency(self):
+    def _export_edge_length_frequency(self, lengths):
         """Export edge length frequency distribution to CSV"""
         filename = "edge_length_frequency.csv"
         
         try:
-            # Calculate all edge lengths and count frequencies
-            length_counts = {}
-            
-            for edge in self.edges:
-                start_node, end_node = edge
-                start_x, start_y, start_z = start_node
-                end_x, end_y, end_z = end_node
-                edge_length = math.sqrt((end_x - start_x)**2 + (end_y - start_y)**2 + (end_z - start_z)**2)
-                
-                # Round to 2 decimal places for grouping
-                rounded_length = round(edge_length, 2)
-                
-                if rounded_length in length_counts:
-                    length_counts[rounded_length] += 1
-                else:
-                    length_counts[rounded_length] = 1
-            
-            # Sort by length
-            sorted_lengths = sorted(length_counts.items())
-            
-            # Write to CSV
+            # Frequency table from the caller's length array: binning on
+            # integer centimeters keeps the unique/sort in int64 space,
+            # already ordered by length
+            lengths_cm = np.rint(lengths * 100).astype(np.int64)
+            unique_cm, counts = np.unique(lengths_cm, return_counts=True)
+            sorted_lengths = list(zip((unique_cm / 100).tolist(), counts.tolist()))
+
+            # Write to CSV in one batched call
             with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
                 writer = csv.writer(csvfile)
-                
-                # Write header
                 writer.writerow(['Edge Length', 'Count'])
-                
-                # Write length frequencies
-                for length, count in sorted_lengths:
-                    writer.writerow([f"{length:.2f}", count])
+                writer.writerows([f"{length:.2f}", count]
+                                 for length, count in sorted_lengths)
             
             print(f"Edge length frequency exported to: {filename}")
             print(f"Found {len(sorted_lengths)} unique edge lengths")
@@ -805,89 +1148,46 @@ class NetworkVisualizer(QMainWindow):
         """Calculate window boundaries based on network area"""
         if not self.nodes:
             return 0, 0, 0, 0
-        
-        # Get network bounds
-        all_coords = list(self.nodes)
-        x_coords = [coord[0] for coord in all_coords]
-        y_coords = [coord[1] for coord in all_coords]
-        
-        min_x, max_x = min(x_coords), max(x_coords)
-        min_y, max_y = min(y_coords), max(y_coords)
-        
-        return min_x, max_x, min_y, max_y
+
+        # Bounds only change when the nodes change, but this is called
+        # from several draw helpers per redraw - memoize the min/max
+        # scan and drop the cache when load_data repopulates the nodes
+        if self._bounds is None:
+            if len(self.node_xyz) == len(self.nodes):
+                arr = self.node_xyz[:, :2]
+            else:
+                arr = np.array(list(self.nodes))[:, :2]
+            mins = arr.min(axis=0)
+            maxs = arr.max(axis=0)
+            self._bounds = (float(mins[0]), float(maxs[0]),
+                            float(mins[1]), float(maxs[1]))
+        return self._bounds
     
     def _calculate_grid_coordinates(self):
         """Calculate coordinates for grid based on unique start_X and start_Y values from CSV"""
         try:
-            # Read the CSV file to get all coordinate values
-            df = pd.read_csv('Oct10_003_stephan.csv')
-            
-            # Extract all unique X and Y coordinates from START points only
-            # Exclude intercom edges from grid generation
-            all_x = set()
-            all_y = set()
-            
-            for _, row in df.iterrows():
-                # Skip intercom edges - don't use them for grid generation
-                edge_type = str(row.get('Type', 'Normal')).strip()
-                if edge_type.lower() != 'intercom':
-                    all_x.add(row['start_X'])
-                    all_y.add(row['start_Y'])
-            
-            # Sort coordinates to get ordered grid positions
-            sorted_x = sorted(all_x)
-            sorted_y = sorted(all_y)
-            
+            # Unique start X/Y from non-intercom rows, sorted via
+            # np.unique; the full cross product comes from one meshgrid
+            # instead of per-row set inserts and a nested Python loop
+            rows = self._load_csv_rows()
+            keep = [str(row.get('Type') or 'Normal').strip().lower() != 'intercom'
+                    for row in rows]
+            sorted_x = np.unique(np.array(
+                [float(row['start_X']) for row, k in zip(rows, keep) if k]))
+            sorted_y = np.unique(np.array(
+                [float(row['start_Y']) for row, k in zip(rows, keep) if k]))
+
             print(f"Grid: Found {len(sorted_x)} unique start_X coordinates, {len(sorted_y)} unique start_Y coordinates (excluding intercom edges)")
-            
-            # Create grid points from all combinations of actual coordinates
-            grid_points = []
-            for y in sorted_y:
-                for x in sorted_x:
-                    grid_points.append((x, y))
-            
-            return grid_points
+
+            # Grid points from all combinations, in the same row-major
+            # (y outer, x inner) order the nested loop produced
+            xs, ys = np.meshgrid(sorted_x, sorted_y)
+            return [tuple(p) for p in np.column_stack([xs.ravel(), ys.ravel()]).tolist()]
             
         except Exception as e:
             print(f"Error reading CSV for grid: {e}")
             return []
     
-    def _find_closest_window_center(self, node):
-        """Find the closest center point of the 4 window edges to a given node"""
-        x, y = node[0], node[1]
-        min_x, max_x, min_y, max_y = self._get_window_bounds()
-        
-        # Calculate center points of each window edge
-        center_points = []
-        
-        # Left edge center
-        left_center = (min_x, (min_y + max_y) / 2)
-        center_points.append(left_center)
-        
-        # Right edge center
-        right_center = (max_x, (min_y + max_y) / 2)
-        center_points.append(right_center)
-        
-        # Bottom edge center
-        bottom_center = ((min_x + max_x) / 2, min_y)
-        center_points.append(bottom_center)
-        
-        # Top edge center
-        top_center = ((min_x + max_x) / 2, max_y)
-        center_points.append(top_center)
-        
-        # Calculate Euclidean distances to each center point
-        distances = []
-        for center_x, center_y in center_points:
-            distance = math.sqrt((x - center_x)**2 + (y - center_y)**2)
-            distances.append(distance)
-        
-        # Find minimum distance and corresponding center point
-        min_distance = min(distances)
-        closest_center = center_points[distances.index(min_distance)]
-        
-        return closest_center, min_distance
-    
     def _draw_grid(self):
         """Draw the complete 17x13 grid as background"""
         if not self.show_grid:
@@ -900,10 +1200,12 @@ class NetworkVisualizer(QMainWindow):
         grid_brush = QBrush(QColor(0, 0, 0))  # Black fill
         grid_diameter = self.node_diameter  # Same size as network nodes
         grid_radius = grid_diameter / 2
+        # One path item for every grid dot instead of an ellipse item each
+        grid_path = QPainterPath()
         for x, y in grid_points:
-            # Draw grid point as small circle
-            self.scene.addEllipse(x - grid_radius, y - grid_radius,
-                                grid_diameter, grid_diameter, grid_pen, grid_brush)
+            grid_path.addEllipse(x - grid_radius, y - grid_radius,
+                                 grid_diameter, grid_diameter)
+        self.scene.addPath(grid_path, grid_pen, grid_brush)
      
         # Calculate actual grid dimensions from the coordinate data
         if len(grid_points) > 0:
@@ -1000,9 +1302,11 @@ class NetworkVisualizer(QMainWindow):
         all_y_coords = sorted(set(node[1] for node in grid_nodes))  # Ascending: low Y at top
         all_x_coords = sorted(set(node[0] for node in grid_nodes))  # Left to right
         
-        # Use same font and size as rectangle edge distance labels
+        # Use same font and size as rectangle edge distance labels; one
+        # QFont shared by every label (Qt copies it on setFont)
         label_color = QColor(0, 0, 0)  # Black text
-        label_font_size = max(1, int(self.font_size * 0.5))  # Same as edge labels
+        label_font = QFont()
+        label_font.setPointSize(max(1, int(self.font_size * 0.5)))  # Same as edge labels
         
         # Draw row labels (letters) on the left side
         # Start with A at lowest Y (top row)
@@ -1018,9 +1322,7 @@ class NetworkVisualizer(QMainWindow):
             
             row_label = self.scene.addText(letter)
             row_label.setDefaultTextColor(label_color)
-            font = row_label.font()
-            font.setPointSize(label_font_size)
-            row_label.setFont(font)
+            row_label.setFont(label_font)
             
             # Position to the left of the frame, centered on the row (very close)
             label_rect = row_label.boundingRect()
@@ -1032,9 +1334,7 @@ class NetworkVisualizer(QMainWindow):
             
             col_label = self.scene.addText(col_number)
             col_label.setDefaultTextColor(label_color)
-            font = col_label.font()
-            font.setPointSize(label_font_size)
-            col_label.setFont(font)
+            col_label.setFont(label_font)
             
             # Position above the top of frame (at min_y, which is visually at top, very close)
             label_rect = col_label.boundingRect()
@@ -1059,33 +1359,36 @@ class NetworkVisualizer(QMainWindow):
         print(f"Window bounds: x=[{min_x}, {max_x}], y=[{min_y}, {max_y}]")
         
         # Group edges by the Y coordinate of the ArtNet node that powers them
-        # Each edge requires 1 amp, so count edges per row
-        row_amps = {}  # Maps Y coordinate to amp count
-        
-        for edge in self.edges:
-            data_start, data_end = self.artnet_optimization['edge_directions'].get(edge, (None, None))
-            
-            if data_start is not None:
-                # Get the Y coordinate of the ArtNet node powering this edge
-                source_y = data_start[1]
-                
-                if source_y not in row_amps:
-                    row_amps[source_y] = 0
-                row_amps[source_y] += 1  # 1 amp per edge
-        
-        # Sort rows by Y coordinate (top to bottom)
-        sorted_rows = sorted(row_amps.items(), key=lambda x: -x[0])  # Negative for top-to-bottom
-        
-        print(f"Found {len(row_amps)} rows with power consumption")
+        # Each edge requires 1 amp, so count edges per row; the tally is
+        # one np.unique over the powering-node Y coords instead of a
+        # per-edge dict increment
+        edge_directions = self.artnet_optimization['edge_directions']
+        ys = np.array([edge_directions[edge][0][1] for edge in self.edges
+                       if edge_directions.get(edge, (None, None))[0] is not None])
+        if ys.size:
+            uniq, cnt = np.unique(ys, return_counts=True)
+        else:
+            uniq = cnt = np.empty(0)
+
+        # Sort rows by Y coordinate (top to bottom) - negated argsort,
+        # keeping uniq/cnt as arrays so the violation scan below is one
+        # mask instead of another pass over a list of pairs
+        order = np.argsort(-uniq)
+        uniq, cnt = uniq[order], cnt[order]
+        sorted_rows = list(zip(uniq.tolist(), cnt.tolist()))
+
+        print(f"Found {len(sorted_rows)} rows with power consumption")
         for row_y, amps in sorted_rows[:5]:  # Show first 5
             print(f"  Y={row_y:.1f}: {amps}A")
         
         # Display text to the right of the frame (just outside the dashed rectangle)
         text_x = max_x + 1.5  # Position just to the right of dashed outline
         max_amps = 20  # 20 amp limit per row
-        # Use same small font as grid labels
+        # Use same small font as grid labels, one QFont for all rows
         amp_font_size = max(1, int(self.font_size * 0.5))
-        
+        amp_font = QFont()
+        amp_font.setPointSize(amp_font_size)
+
         print(f"Displaying at x={text_x}, font_size={amp_font_size}")
         
         # Draw each row's power consumption aligned with the actual row Y coordinate
@@ -1101,24 +1404,23 @@ class NetworkVisualizer(QMainWindow):
             # Create text showing just the amp value
             row_text = self.scene.addText(f"{amps}A")
             row_text.setDefaultTextColor(color)
-            font = row_text.font()
-            font.setPointSize(amp_font_size)  # Same as grid labels
-            row_text.setFont(font)
+            row_text.setFont(amp_font)
             
             # Position text at the ACTUAL Y coordinate of the row (centered vertically)
             text_rect = row_text.boundingRect()
             row_text.setPos(text_x, row_y - text_rect.height() / 2)
         
-        # Check for violations and print summary
-        violations = [y for y, amps in row_amps.items() if amps > max_amps]
-        if violations:
-            print(f"\n⚠️  Power Warning: {len(violations)} row(s) exceed 20A limit:")
-            for row_y in sorted(violations, reverse=True):
-                amps = row_amps[row_y]
+        # Check for violations and print summary - one vectorized mask
+        # over the already-sorted counts
+        violations_mask = cnt > max_amps
+        if violations_mask.any():
+            print(f"\n⚠️  Power Warning: {int(violations_mask.sum())} row(s) exceed 20A limit:")
+            for row_y, amps in zip(uniq[violations_mask].tolist(),
+                                   cnt[violations_mask].tolist()):
                 excess = amps - max_amps
                 print(f"   Y={row_y:.1f}: {amps}A (excess: {excess}A)")
-        else:
-            print(f"\n✅ All rows within 20A limit (max: {max(row_amps.values())}A)")
+        elif sorted_rows:
+            print(f"\n✅ All rows within 20A limit (max: {int(cnt.max())}A)")
     
     def _draw_data_cables(self):
         """Draw data cables from ArtNet nodes to closest window edges"""
@@ -1151,28 +1453,43 @@ class NetworkVisualizer(QMainWindow):
             self.scene.addEllipse(center_x - center_radius/2, center_y - center_radius/2,
                                 center_radius, center_radius, center_pen, center_brush)
         
-        # Draw cables from ArtNet nodes to window edge centers
-        for artnet_node in self.artnet_optimization['artnet_nodes']:
+        # Draw cables from ArtNet nodes to window edge centers; the
+        # closest center for every ArtNet node comes from one (A,4)
+        # distance matrix instead of a per-node min()/index() pass, and
+        # the lines share one pen, so they are coalesced into a single
+        # path item
+        artnet_nodes = self.artnet_optimization['artnet_nodes']
+        if not artnet_nodes:
+            return
+        pts = np.array([(n[0], n[1]) for n in artnet_nodes])
+        centers = np.array([left_center, right_center, bottom_center, top_center])
+        dists = np.sqrt(((pts[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2))
+        closest_idx = dists.argmin(axis=1)
+        cable_lengths = dists[np.arange(len(pts)), closest_idx]
+        closest_pts = centers[closest_idx]
+
+        # One shared font and color for every length label
+        label_color = QColor(0, 0, 0)  # Black text
+        label_font = QFont()
+        label_font.setPointSize(max(1, int(self.font_size * 0.5)))  # 50% smaller, minimum size 1
+
+        cables_path = QPainterPath()
+        for i, artnet_node in enumerate(artnet_nodes):
             node_x, node_y = artnet_node[0], artnet_node[1]
-            
-            # Find closest window center point
-            closest_point, cable_length = self._find_closest_window_center(artnet_node)
-            closest_x, closest_y = closest_point
-            
-            # Draw cable line
-            self.scene.addLine(node_x, node_y, closest_x, closest_y, cable_pen)
+            closest_x, closest_y = closest_pts[i]
+            cable_length = cable_lengths[i]
+
+            # Cable line
+            cables_path.moveTo(node_x, node_y)
+            cables_path.lineTo(closest_x, closest_y)
             
             # Add length text at midpoint of cable
             mid_x = (node_x + closest_x) / 2
             mid_y = (node_y + closest_y) / 2
             
             length_text = self.scene.addText(f"{cable_length:.1f}m")
-            length_text.setDefaultTextColor(QColor(0, 0, 0))  # Black text
-            
-            # Set font size to 50% of current font size
-            font = length_text.font()
-            font.setPointSize(max(1, int(self.font_size * 0.5)))  # 50% smaller, minimum size 1
-            length_text.setFont(font)
+            length_text.setDefaultTextColor(label_color)
+            length_text.setFont(label_font)
             
             # Position text at midpoint
             text_rect = length_text.boundingRect()
@@ -1182,60 +1499,60 @@ class NetworkVisualizer(QMainWindow):
             
             total_length += cable_length
         
+        if not cables_path.isEmpty():
+            self.scene.addPath(cables_path, cable_pen)
+        
         self.total_cable_length = total_length
         self.cable_info_label.setText(f"Total Cable Length: {total_length:.2f}m")
         
         print(f"Data cables: {len(self.artnet_optimization['artnet_nodes'])} cables, total length: {total_length:.2f}m")
     
-    def _draw_arrow(self, start_node, end_node, pen):
-        """Draw an arrow from start_node to end_node"""
-        start_x, start_y = start_node[0], start_node[1]
-        end_x, end_y = end_node[0], end_node[1]
-        
-        # Calculate arrow direction
-        dx = end_x - start_x
-        dy = end_y - start_y
-        length = math.sqrt(dx*dx + dy*dy)
-        
-        if length == 0:
+    def _draw_arrows(self, pairs, pen):
+        """Draw arrows for a batch of (start_node, end_node) pairs
+
+        All shaft and head vertices are computed with NumPy in one pass
+        and emitted as a single QPainterPath item, instead of a sqrt,
+        an atan2, four trig calls and three addLine items per arrow.
+        Rotating the unit vector by the fixed head angle replaces the
+        atan2/cos/sin round trip: dir(angle±a) = u*cos(a) ± perp*sin(a).
+        """
+        if not pairs:
             return
-        
-        # Normalize direction
-        dx /= length
-        dy /= length
-        
-        # Start arrow from node edge (not center)
+
+        s = np.array([(a[0], a[1]) for a, b in pairs])
+        e = np.array([(b[0], b[1]) for a, b in pairs])
+        d = e - s
+        lengths = np.sqrt((d * d).sum(axis=1))
+        keep = lengths > 0
+        if not keep.all():
+            s, e, d, lengths = s[keep], e[keep], d[keep], lengths[keep]
+        if not lengths.size:
+            return
+        u = d / lengths[:, None]
+
+        # Shaft: starts at the node edge, spans a percentage of the
+        # remaining edge length
         node_radius = self.node_diameter / 2
-        arrow_start_x = start_x + dx * node_radius
-        arrow_start_y = start_y + dy * node_radius
-        
-        # Calculate arrow length based on percentage of edge length
-        arrow_length = (length - 2 * node_radius) * (self.arrow_length_percent / 100.0)
-        
-        # End arrow at the calculated length
-        arrow_end_x = arrow_start_x + dx * arrow_length
-        arrow_end_y = arrow_start_y + dy * arrow_length
-        
-        # Draw the arrow line
-        self.scene.addLine(arrow_start_x, arrow_start_y, arrow_end_x, arrow_end_y, pen)
-        
-        # Draw arrowhead
+        start = s + u * node_radius
+        end = start + u * ((lengths - 2 * node_radius) * (self.arrow_length_percent / 100.0))[:, None]
+
+        # Arrowhead corners via the rotated unit vector
         arrowhead_length = 1.0
         arrowhead_angle = 0.5  # radians
-        
-        # Calculate arrowhead points
-        angle = math.atan2(dy, dx)
-        angle1 = angle + arrowhead_angle
-        angle2 = angle - arrowhead_angle
-        
-        arrowhead_x1 = arrow_end_x - arrowhead_length * math.cos(angle1)
-        arrowhead_y1 = arrow_end_y - arrowhead_length * math.sin(angle1)
-        arrowhead_x2 = arrow_end_x - arrowhead_length * math.cos(angle2)
-        arrowhead_y2 = arrow_end_y - arrowhead_length * math.sin(angle2)
-        
-        # Draw arrowhead lines
-        self.scene.addLine(arrow_end_x, arrow_end_y, arrowhead_x1, arrowhead_y1, pen)
-        self.scene.addLine(arrow_end_x, arrow_end_y, arrowhead_x2, arrowhead_y2, pen)
+        cos_a = math.cos(arrowhead_angle)
+        sin_a = math.sin(arrowhead_angle)
+        perp = np.stack([-u[:, 1], u[:, 0]], axis=1)
+        head1 = end - arrowhead_length * (u * cos_a + perp * sin_a)
+        head2 = end - arrowhead_length * (u * cos_a - perp * sin_a)
+
+        path = QPainterPath()
+        for i in range(len(start)):
+            path.moveTo(start[i, 0], start[i, 1])
+            path.lineTo(end[i, 0], end[i, 1])
+            path.lineTo(head1[i, 0], head1[i, 1])
+            path.moveTo(end[i, 0], end[i, 1])
+            path.lineTo(head2[i, 0], head2[i, 1])
+        self._arrows_path_item = self.scene.addPath(path, pen)
     
     def resizeEvent(self, event):
         """Handle window resize events"""
@@ -1245,21 +1562,39 @@ class NetworkVisualizer(QMainWindow):
     
     def draw_network(self):
         """Draw the network on the graphics scene"""
+        # Nothing changed since the last full rebuild (e.g. a resize
+        # event landed here): keep the scene as-is and just refit the
+        # view to the new viewport size
+        if self._state_version == self._last_rendered_version:
+            self.view.resetTransform()
+            self.view.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
+            self.view.scale(0.95, 0.95)
+            return
+
+        # The BSP tree index rebuilds as items are added, so bulk
+        # population is done unindexed and the index is restored once
+        # the scene is complete (hover hit-testing uses the KD-tree,
+        # but the view still walks the index when repainting)
+        self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
         self.scene.clear()
+        # scene.clear() destroys the underlying items, so drop the handles
+        self._node_items.clear()
+        self._edge_items.clear()
+        self._edges_path_item = None
+        self._arrows_path_item = None
+        self._intercom_marker_items.clear()
+        self._artnet_rect_items.clear()
         
         if not self.nodes:
+            self.scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+            self._last_rendered_version = self._state_version
             return
-        
+
         # Draw grid first (background layer)
         self._draw_grid()
         
-        # Calculate bounds for scaling
-        all_coords = list(self.nodes)
-        x_coords = [coord[0] for coord in all_coords]
-        y_coords = [coord[1] for coord in all_coords]
-        
-        min_x, max_x = min(x_coords), max(x_coords)
-        min_y, max_y = min(y_coords), max(y_coords)
+        # Calculate bounds for scaling (memoized scan)
+        min_x, max_x, min_y, max_y = self._get_window_bounds()
         
         # Add minimal padding
         padding = 5
@@ -1277,160 +1612,158 @@ class NetworkVisualizer(QMainWindow):
         
         # Draw edges first (so they appear behind nodes)
         # Always draw highlighted edges if a length is selected, optionally draw all edges
-        normal_pen = QPen(QColor(100, 100, 100), self.line_width)
-        highlighted_pen = QPen(QColor(255, 0, 0), self.line_width * 8)  # Bright red, 8x thicker
         
         # Get selected length if any
         selected_length = None
         if self.selected_length_group >= 0 and self.selected_length_group < len(self.length_groups):
             selected_length, _ = self.length_groups[self.selected_length_group]
-        
-        for start_node, end_node in self.edges:
+
+        # Highlight test in one vectorized pass over the pre-rounded
+        # length cache - no sqrt or rounding work left per redraw
+        if selected_length is not None:
+            if not hasattr(self, '_edge_lengths_r2'):
+                self.calculate_length_groups()
+            highlight_mask = np.abs(self._edge_lengths_r2 - selected_length) < 0.01
+        else:
+            highlight_mask = None
+
+        # All normal edges are coalesced into one QPainterPath/addPath -
+        # one scene item and one Python-to-Qt call instead of one per
+        # edge; highlighted edges stay individual items for the red pen
+        edges_path = QPainterPath()
+        for i, (start_node, end_node) in enumerate(self.edges):
             start_x, start_y = start_node[0], start_node[1]
             end_x, end_y = end_node[0], end_node[1]
-            
-            # Check if this edge should be highlighted
-            use_highlighted = False
-            if selected_length is not None:
-                dx = end_node[0] - start_node[0]
-                dy = end_node[1] - start_node[1]
-                dz = end_node[2] - start_node[2]
-                edge_length = round(math.sqrt(dx*dx + dy*dy + dz*dz), 2)
-                use_highlighted = (abs(edge_length - selected_length) < 0.01)
-            
+
             # Draw edge if: (show_edges is on) OR (this edge is highlighted)
-            if self.show_edges or use_highlighted:
-                pen = highlighted_pen if use_highlighted else normal_pen
-                self.scene.addLine(start_x, start_y, end_x, end_y, pen)
-        
-        # Draw nodes
-        node_brush = QBrush(QColor(255, 0, 0))  # Red nodes
-        node_pen = QPen(QColor(0, 0, 0), 1)
-        
-        # ArtNet node colors
-        artnet_brush = QBrush(QColor(0, 255, 0))  # Green for ArtNet nodes
-        artnet_pen = QPen(QColor(0, 0, 0), 2)
-        
-        # Rectangle pen for ArtNet nodes
-        rect_pen = QPen(QColor(0, 0, 255), 2)  # Blue rectangle
-        
-        for node in self.nodes:
+            if highlight_mask is not None and highlight_mask[i]:
+                edge_item = self.scene.addLine(start_x, start_y, end_x, end_y, self._highlighted_pen)
+                self._edge_items[(start_node, end_node)] = edge_item
+            elif self.show_edges:
+                edges_path.moveTo(start_x, start_y)
+                edges_path.lineTo(end_x, end_y)
+        if not edges_path.isEmpty():
+            self._edges_path_item = self.scene.addPath(edges_path, self._normal_pen)
+        
+        # Node styles come from the cached set built by _build_styles
+        node_brush = self._node_brush
+        node_pen = self._node_pen
+        artnet_brush = self._artnet_brush
+        artnet_pen = self._artnet_pen
+        rect_pen = self._rect_pen
+
+        # Arrow counts per ArtNet node, tallied once from the cached
+        # arrow origins (the removed per-node edge scan re-ran the
+        # identical classification for every ArtNet node)
+        # One membership set shared by the whole node pass (the arrow
+        # pass below hoists the same set); empty when ArtNet display is
+        # off so the per-node check is a single hash probe either way
+        if self.artnet_optimization and self.show_artnet_nodes:
+            artnet_display_ids = self._artnet_ids
+            arrow_from_count = Counter(
+                origin for origin in self._arrow_from.values() if origin is not None)
+        else:
+            artnet_display_ids = frozenset()
+            arrow_from_count = {}
+
+        # Per-node items are constructed directly, parented to one
+        # QGraphicsItemGroup and inserted with a single scene.addItem -
+        # one scene insertion instead of one per marker. The retained
+        # dicts keep the child items for in-place restyling
+        intercom_pen = self._intercom_pen
+        count_brush = self._count_brush
+        count_font = self._count_font
+        node_group = QGraphicsItemGroup()
+
+        # Iterate the SoA view in node-ID order: the circle corners come
+        # from two vectorized subtractions instead of per-node float
+        # arithmetic, and .tolist() turns them into plain floats once
+        radius = self.node_diameter / 2
+        intercom_size = self.node_diameter * 1.5
+        lefts = (self.node_xyz[:, 0] - radius).tolist()
+        tops = (self.node_xyz[:, 1] - radius).tolist()
+        ic_lefts = (self.node_xyz[:, 0] - intercom_size / 2).tolist()
+        ic_tops = (self.node_xyz[:, 1] - intercom_size / 2).tolist()
+
+        # Membership via int node IDs: hashing one int beats hashing a
+        # tuple of three floats for every node in the pass
+        node_ids = self.node_ids
+        intercom_ids = self._intercom_ids
+
+        for i, node in enumerate(self._node_list):
             x, y = node[0], node[1]
-            radius = self.node_diameter / 2
-            
+            nid = node_ids[node]
+
             # Check if this is an ArtNet node
-            is_artnet = (self.artnet_optimization and 
-                        self.show_artnet_nodes and 
-                        node in self.artnet_optimization['artnet_nodes'])
-            
+            is_artnet = nid in artnet_display_ids
+
             # Choose brush and pen based on node type
             brush = artnet_brush if is_artnet else node_brush
             pen = artnet_pen if is_artnet else node_pen
-            
+
             # Draw circle for node
-            ellipse = self.scene.addEllipse(x - radius, y - radius, 
-                                 self.node_diameter, self.node_diameter,
-                                 pen, brush)
-            
+            ellipse = QGraphicsEllipseItem(lefts[i], tops[i],
+                                           self.node_diameter, self.node_diameter)
+            ellipse.setPen(pen)
+            ellipse.setBrush(brush)
+            node_group.addToGroup(ellipse)
+            self._node_items[node] = ellipse
+
             # Draw special marker for intercom nodes (orange circle)
-            if node in self.intercom_nodes:
-                intercom_pen = QPen(QColor(255, 140, 0), 3)  # Orange border, thick
-                intercom_size = self.node_diameter * 1.5
-                self.scene.addEllipse(x - intercom_size/2, y - intercom_size/2,
-                                     intercom_size, intercom_size, intercom_pen)
-            
+            if nid in intercom_ids:
+                marker = QGraphicsEllipseItem(ic_lefts[i], ic_tops[i],
+                                              intercom_size, intercom_size)
+                marker.setPen(intercom_pen)
+                node_group.addToGroup(marker)
+                self._intercom_marker_items[node] = marker
+
             # Draw rectangle around ArtNet nodes
             if is_artnet:
                 rect_size = self.node_diameter
-                self.scene.addRect(x - rect_size/2, y - rect_size/2, 
-                                  rect_size, rect_size, rect_pen)
-                
-                # Count arrows drawn FROM this ArtNet node - USE EXACT SAME LOGIC AS ARROW DRAWING
-                arrow_count = 0
-                if self.artnet_optimization and self.show_artnet_nodes:
-                    artnet_nodes_set = set(self.artnet_optimization['artnet_nodes'])
-                    
-                    for edge in self.edges:
-                        start_node, end_node = edge
-                        arrow_from = None  # Will be set to the node the arrow starts from
-                        
-                        # EXACT SAME LOGIC AS ARROW DRAWING
-                        if edge in self.intercom_edges:
-                            # Intercom edge
-                            if start_node in self.intercom_nodes:
-                                arrow_from = end_node  # Arrow FROM end_node TO start_node
-                            elif end_node in self.intercom_nodes:
-                                arrow_from = start_node  # Arrow FROM start_node TO end_node
-                        elif start_node in artnet_nodes_set and end_node in artnet_nodes_set:
-                            # Both endpoints are ArtNet
-                            if 'edge_directions' in self.artnet_optimization:
-                                data_start, data_end = self.artnet_optimization['edge_directions'].get(edge, (None, None))
-                                if (data_start == start_node and data_end == end_node) or \
-                                   (data_start == end_node and data_end == start_node):
-                                    arrow_from = data_start
-                                # If redirected, don't count (arrow_from stays None)
-                            else:
-                                arrow_from = start_node
-                        elif start_node in artnet_nodes_set:
-                            arrow_from = start_node  # Only start is ArtNet
-                        elif end_node in artnet_nodes_set:
-                            arrow_from = end_node  # Only end is ArtNet
-                        
-                        # Count if arrow starts from this node
-                        if arrow_from == node:
-                            arrow_count += 1
-                
-                # Display the count ONLY for ArtNet nodes
-                if is_artnet and self.artnet_optimization and self.show_artnet_nodes:
-                    count_text = self.scene.addText(str(arrow_count))
-                    count_text.setDefaultTextColor(QColor(0, 100, 255))  # Blue text
-                    # Set font size
-                    font = count_text.font()
-                    font.setPointSize(self.font_size)
-                    count_text.setFont(font)
-                    # Center the text on the ArtNet node
-                    text_rect = count_text.boundingRect()
-                    text_x = x - text_rect.width() / 2
-                    text_x = text_x + 2
-                    text_y = y - text_rect.height() / 2
-                    count_text.setPos(text_x, text_y)
+                rect = QGraphicsRectItem(x - rect_size/2, y - rect_size/2,
+                                         rect_size, rect_size)
+                rect.setPen(rect_pen)
+                node_group.addToGroup(rect)
+                self._artnet_rect_items[node] = rect
+
+                # Count arrows drawn FROM this ArtNet node - same
+                # classification as arrow drawing, via the cached tally;
+                # displayed ONLY for ArtNet nodes
+                # QGraphicsSimpleTextItem paints plain glyphs - no
+                # QTextDocument layout machinery behind each label
+                arrow_count = arrow_from_count.get(node, 0)
+                count_text = QGraphicsSimpleTextItem(str(arrow_count))
+                count_text.setBrush(count_brush)
+                count_text.setFont(count_font)
+                node_group.addToGroup(count_text)
+                # Center the text on the ArtNet node
+                text_rect = count_text.boundingRect()
+                text_x = x - text_rect.width() / 2
+                text_x = text_x + 2
+                text_y = y - text_rect.height() / 2
+                count_text.setPos(text_x, text_y)
+
+        self.scene.addItem(node_group)
         
         # Draw directional arrows from ArtNet nodes
         if self.artnet_optimization and self.show_artnet_nodes and self.show_edges:
-            arrow_pen = QPen(QColor(255, 0, 255), self.arrow_width)  # Magenta arrows with adjustable width
-            
-            # Draw arrows along PHYSICAL edges based on which endpoint is ArtNet node
+            arrow_pen = self._arrow_pen
+            
+            # Arrows along PHYSICAL edges, read straight from the cached
+            # origin table: _arrow_from already resolved the intercom /
+            # both-ArtNet / single-ArtNet cascade (including dropping
+            # redirected edges), so each edge is one dict lookup and the
+            # arrow simply runs from the origin to the other endpoint
+            arrow_from = self._arrow_from
+            arrow_pairs = []
             for edge in self.edges:
+                origin = arrow_from.get(edge)
+                if origin is None:
+                    continue
                 start_node, end_node = edge
-                artnet_nodes_set = set(self.artnet_optimization['artnet_nodes'])
-                
-                # Special case: For intercom edges, arrow from smart node to intercom node
-                if edge in self.intercom_edges:
-                    # Draw arrow FROM non-intercom node TO intercom node
-                    if start_node in self.intercom_nodes:
-                        # Intercom node is at start, arrow goes TO it
-                        self._draw_arrow(end_node, start_node, arrow_pen)
-                    elif end_node in self.intercom_nodes:
-                        # Intercom node is at end, arrow goes TO it
-                        self._draw_arrow(start_node, end_node, arrow_pen)
-                # Normal edges: Draw arrow FROM ArtNet node
-                elif start_node in artnet_nodes_set and end_node in artnet_nodes_set:
-                    # Both endpoints are ArtNet - use balanced direction if available
-                    if 'edge_directions' in self.artnet_optimization:
-                        data_start, data_end = self.artnet_optimization['edge_directions'].get(edge, (None, None))
-                        # Only draw if the direction is along this physical edge
-                        if (data_start == start_node and data_end == end_node) or \
-                           (data_start == end_node and data_end == start_node):
-                            self._draw_arrow(data_start, data_end, arrow_pen)
-                        # If redirected, DON'T draw an arrow on this physical edge
-                    else:
-                        self._draw_arrow(start_node, end_node, arrow_pen)
-                elif start_node in artnet_nodes_set:
-                    # Only start is ArtNet - arrow goes from start to end
-                    self._draw_arrow(start_node, end_node, arrow_pen)
-                elif end_node in artnet_nodes_set:
-                    # Only end is ArtNet - arrow goes from end to start
-                    self._draw_arrow(end_node, start_node, arrow_pen)
+                target = end_node if origin == start_node else start_node
+                arrow_pairs.append((origin, target))
+            self._draw_arrows(arrow_pairs, arrow_pen)
         
         # Draw window cables if enabled
         # Always draw window frame
@@ -1446,13 +1779,21 @@ class NetworkVisualizer(QMainWindow):
         self._draw_data_cables()
         
         # Draw power cables if enabled
-        
-        # Fit view to scene with a small margin
+
+        # Population done - reindex once instead of per added item
+        self.scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+
+        # Fit view to scene with a small margin; reset the transform
+        # first so the 0.95 margin scale below is applied exactly once
+        # per redraw and can never accumulate across redraws
+        self.view.resetTransform()
         self.view.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
-        
+
         # Add a small margin by scaling slightly
         self.view.scale(0.95, 0.95)
-        
+
+        self._last_rendered_version = self._state_version
+
         # Update info labels
         self.node_count_label.setText(f"Nodes: {len(self.nodes)}")
         self.edge_count_label.setText(f"Edges: {len(self.edges)}")